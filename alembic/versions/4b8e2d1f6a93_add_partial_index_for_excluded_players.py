@@ -0,0 +1,32 @@
+"""Add partial index for excluded players
+
+Revision ID: 4b8e2d1f6a93
+Revises: cc267f7278df
+Create Date: 2026-10-15 12:20:41.503117
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4b8e2d1f6a93"
+down_revision = "cc267f7278df"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Serves "WHERE status = 'Отчислен' ORDER BY exclusion_date DESC"
+    op.create_index(
+        "idx_players_excluded",
+        "players",
+        ["exclusion_date"],
+        postgresql_where=sa.text("status = 'Отчислен'"),
+        sqlite_where=sa.text("status = 'Отчислен'"),
+    )
+
+
+def downgrade():
+    op.drop_index("idx_players_excluded", table_name="players")
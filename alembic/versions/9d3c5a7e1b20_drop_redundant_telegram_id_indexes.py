@@ -0,0 +1,26 @@
+"""Drop redundant telegram_id indexes
+
+Revision ID: 9d3c5a7e1b20
+Revises: 4b8e2d1f6a93
+Create Date: 2026-10-15 13:05:12.884310
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9d3c5a7e1b20"
+down_revision = "4b8e2d1f6a93"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # UNIQUE (telegram_id) already provides an index for lookups and EXISTS checks
+    op.drop_index("idx_players_telegram_id", table_name="players")
+    op.drop_index("idx_pending_telegram_id", table_name="pending_registrations")
+
+
+def downgrade():
+    op.create_index("idx_pending_telegram_id", "pending_registrations", ["telegram_id"])
+    op.create_index("idx_players_telegram_id", "players", ["telegram_id"])
@@ -0,0 +1,26 @@
+"""Replace status index with composite (status, id) index
+
+Revision ID: cc267f7278df
+Revises: 617d74853330
+Create Date: 2026-10-15 09:51:37.218406
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "cc267f7278df"
+down_revision = "617d74853330"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Composite index serves "WHERE status = ? ORDER BY id LIMIT ?" and COUNT by status
+    op.drop_index("idx_players_status", table_name="players")
+    op.create_index("idx_players_status_id", "players", ["status", "id"])
+
+
+def downgrade():
+    op.drop_index("idx_players_status_id", table_name="players")
+    op.create_index("idx_players_status", "players", ["status"])
@@ -0,0 +1,35 @@
+"""Replace partial excluded players index with status, exclusion_date
+
+Revision ID: e61f0c4a8d57
+Revises: 9d3c5a7e1b20
+Create Date: 2026-10-15 13:48:09.217645
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e61f0c4a8d57"
+down_revision = "9d3c5a7e1b20"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The repository binds status as a parameter, so planners cannot match the
+    # partial index predicate; a composite index serves it either way
+    op.create_index("idx_players_status_exclusion", "players", ["status", "exclusion_date"])
+    op.drop_index("idx_players_excluded", table_name="players")
+
+
+def downgrade():
+    op.create_index(
+        "idx_players_excluded",
+        "players",
+        ["exclusion_date"],
+        postgresql_where=sa.text("status = 'Отчислен'"),
+        sqlite_where=sa.text("status = 'Отчислен'"),
+    )
+    op.drop_index("idx_players_status_exclusion", table_name="players")
@@ -1,146 +1,149 @@
 """Admin handlers for managing players and registrations."""
 
+import asyncio
 import logging
-from datetime import datetime
 
-from aiogram import F, Router
+from aiogram import Router
 from aiogram.filters import Command
 from aiogram.types import CallbackQuery, Message
 
 from bot.handlers.decorators import admin_only
+from bot.keyboards.admin import ApproveCallback, RejectCallback
 from config.settings import Settings
 from database.database import Database
 from database.repository import PlayerRepository
-from models.player import Player
+from utils.notifications import notify_users
+from utils.validators import normalize_username
 
 router = Router()
 logger = logging.getLogger(__name__)
 
 
-@router.callback_query(F.data.startswith("approve:"))
+@router.callback_query(ApproveCallback.filter())
 @admin_only
-async def process_approve(callback: CallbackQuery, db: Database, settings: Settings) -> None:
+async def process_approve(
+    callback: CallbackQuery, callback_data: ApproveCallback, db: Database, settings: Settings
+) -> None:
     """
     Handle approval of pending registration.
 
     Args:
         callback: Callback query from approve button
+        callback_data: Parsed callback data with the pending player's telegram_id
         db: Database instance from dispatcher
         settings: Settings instance from dispatcher
     """
 
-    # Extract telegram_id from callback data
-    telegram_id = int(callback.data.split(":")[1])
+    telegram_id = callback_data.telegram_id
 
-    async for session in db.get_session():
+    async with db.session() as session:
         repo = PlayerRepository(session)
 
-        # Get pending registration
-        pending = await repo.get_pending(telegram_id)
-        if not pending:
-            await callback.answer("❌ Заявка не найдена.", show_alert=True)
-            return
-
-        # Check if already registered
-        if await repo.check_player_exists(telegram_id):
-            await callback.answer("❌ Пользователь уже зарегистрирован.", show_alert=True)
-            await repo.remove_pending(telegram_id)
-            return
-
-        # Convert pending to player
-        player = Player(
-            telegram_id=pending.telegram_id,
-            username=pending.username,
-            nickname=pending.nickname,
-            screenshot_path=pending.screenshot_path,
-            registration_date=datetime.now().strftime("%Y-%m-%d"),
-            status="Активен",
-            added_by=f"@{callback.from_user.username or callback.from_user.id}",
-            notes="Одобрено через бот",
-        )
-
-        # Add to database
+        # Move pending registration to players
         try:
-            await repo.add_player(player)
-            await repo.remove_pending(telegram_id)
-            logger.info(f"Player {pending.username} approved by admin")
+            found, player = await repo.approve_pending(
+                telegram_id,
+                added_by=f"@{callback.from_user.username or callback.from_user.id}",
+                notes="Одобрено через бот",
+            )
         except Exception as e:
+            await session.rollback()
             logger.error(f"Failed to approve player: {e}")
             await callback.answer("❌ Ошибка при одобрении заявки.", show_alert=True)
             return
 
-    # Notify user
-    try:
-        await callback.bot.send_message(
-            chat_id=telegram_id,
-            text=(
-                "🎉 <b>Поздравляем!</b>\n\n"
-                "Ваша заявка на вступление в телеграм группу клана одобрена!\n"
-                "Для входа нажмите сюда: <a href='https://t.me/+k_Alie0yCT8wODJi'>👉 ВХОД</a>\n"
-                f"Добро пожаловать, <b>{pending.nickname}</b>!"
-            ),
-        )
-    except Exception as e:
-        logger.warning(f"Failed to notify user {telegram_id}: {e}")
+    if not found:
+        await callback.answer("❌ Заявка не найдена.", show_alert=True)
+        return
+
+    if player is None:
+        await callback.answer("❌ Пользователь уже зарегистрирован.", show_alert=True)
+        return
 
-    # Update admin message
-    await callback.message.edit_caption(
-        caption=f"{callback.message.caption}\n\n✅ <b>Одобрено</b> администратором {callback.from_user.username}",
-        reply_markup=None,
+    logger.info(f"Player {player.username} approved by admin")
+
+    # Notify user and update admin message concurrently
+    _, edit_result = await asyncio.gather(
+        notify_users(
+            callback.bot,
+            [
+                (
+                    telegram_id,
+                    "🎉 <b>Поздравляем!</b>\n\n"
+                    "Ваша заявка на вступление в телеграм группу клана одобрена!\n"
+                    "Для входа нажмите сюда: <a href='https://t.me/+k_Alie0yCT8wODJi'>👉 ВХОД</a>\n"
+                    f"Добро пожаловать, <b>{player.nickname}</b>!",
+                )
+            ],
+        ),
+        callback.message.edit_caption(
+            caption=f"{callback.message.caption}\n\n✅ <b>Одобрено</b> администратором {callback.from_user.username}",
+            reply_markup=None,
+        ),
+        return_exceptions=True,
     )
+    if isinstance(edit_result, Exception):
+        logger.warning(f"Failed to update admin message for {telegram_id}: {edit_result}")
+
     await callback.answer("✅ Заявка одобрена!")
 
 
-@router.callback_query(F.data.startswith("reject:"))
+@router.callback_query(RejectCallback.filter())
 @admin_only
-async def process_reject(callback: CallbackQuery, db: Database, settings: Settings) -> None:
+async def process_reject(
+    callback: CallbackQuery, callback_data: RejectCallback, db: Database, settings: Settings
+) -> None:
     """
     Handle rejection of pending registration.
 
     Args:
         callback: Callback query from reject button
+        callback_data: Parsed callback data with the pending player's telegram_id
         db: Database instance from dispatcher
         settings: Settings instance from dispatcher
     """
 
-    # Extract telegram_id from callback data
-    telegram_id = int(callback.data.split(":")[1])
+    telegram_id = callback_data.telegram_id
 
-    async for session in db.get_session():
+    async with db.session() as session:
         repo = PlayerRepository(session)
 
-        # Get pending registration
-        pending = await repo.get_pending(telegram_id)
-        if not pending:
-            await callback.answer("❌ Заявка не найдена.", show_alert=True)
-            return
-
         # Remove from pending
         try:
-            await repo.remove_pending(telegram_id)
-            logger.info(f"Player {pending.username} rejected by admin")
+            removed = await repo.remove_pending(telegram_id)
         except Exception as e:
+            await session.rollback()
             logger.error(f"Failed to reject player: {e}")
             await callback.answer("❌ Ошибка при отклонении заявки.", show_alert=True)
             return
 
-    # Notify user
-    try:
-        await callback.bot.send_message(
-            chat_id=telegram_id,
-            text=(
-                "❌ К сожалению, ваша заявка на вступление в клан отклонена.\n\n"
-                "Вы можете попробовать зарегистрироваться снова позже: /register"
-            ),
-        )
-    except Exception as e:
-        logger.warning(f"Failed to notify user {telegram_id}: {e}")
+    if not removed:
+        await callback.answer("❌ Заявка не найдена.", show_alert=True)
+        return
 
-    # Update admin message
-    await callback.message.edit_caption(
-        caption=f"{callback.message.caption}\n\n❌ <b>Отклонено</b> администратором {callback.from_user.username}",
-        reply_markup=None,
+    logger.info(f"Player {telegram_id} rejected by admin")
+
+    # Notify user and update admin message concurrently
+    _, edit_result = await asyncio.gather(
+        notify_users(
+            callback.bot,
+            [
+                (
+                    telegram_id,
+                    "❌ К сожалению, ваша заявка на вступление в клан отклонена.\n\n"
+                    "Вы можете попробовать зарегистрироваться снова позже: /register",
+                )
+            ],
+        ),
+        callback.message.edit_caption(
+            caption=f"{callback.message.caption}\n\n❌ <b>Отклонено</b> администратором {callback.from_user.username}",
+            reply_markup=None,
+        ),
+        return_exceptions=True,
     )
+    if isinstance(edit_result, Exception):
+        logger.warning(f"Failed to update admin message for {telegram_id}: {edit_result}")
+
     await callback.answer("❌ Заявка отклонена.")
 
 
@@ -156,25 +159,24 @@ async def cmd_pending(message: Message, db: Database, settings: Settings) -> Non
         settings: Settings instance from dispatcher
     """
 
-    async for session in db.get_session():
-        repo = PlayerRepository(session)
-        pending_list = await repo.get_all_pending()
+    parts: list[str] = ["📋 <b>Ожидающие заявки:</b>\n\n"]
 
-    if not pending_list:
+    async with db.session() as session:
+        repo = PlayerRepository(session)
+        async for pending in repo.stream_all_pending():
+            parts.append(
+                f"👤 {pending.username}\n"
+                f"🎮 Никнейм: <b>{pending.nickname}</b>\n"
+                f"🆔 ID: <code>{pending.telegram_id}</code>\n"
+                f"📅 Дата: {pending.timestamp}\n"
+                f"{'─' * 30}\n"
+            )
+
+    if len(parts) == 1:
         await message.answer("📭 Нет ожидающих заявок.")
         return
 
-    response = "📋 <b>Ожидающие заявки:</b>\n\n"
-    for pending in pending_list:
-        response += (
-            f"👤 {pending.username}\n"
-            f"🎮 Никнейм: <b>{pending.nickname}</b>\n"
-            f"🆔 ID: <code>{pending.telegram_id}</code>\n"
-            f"📅 Дата: {pending.timestamp}\n"
-            f"{'─' * 30}\n"
-        )
-
-    await message.answer(response)
+    await message.answer("".join(parts))
 
 
 @router.message(Command("list"))
@@ -189,36 +191,36 @@ async def cmd_list(message: Message, db: Database, settings: Settings) -> None:
         settings: Settings instance from dispatcher
     """
 
-    async for session in db.get_session():
+    async with db.session() as session:
         repo = PlayerRepository(session)
-        players = await repo.get_all_players()
-
-    if not players:
+        total_count = await repo.count_by_status()
+        if total_count:
+            active_count = await repo.count_by_status("Активен")
+            excluded_count = await repo.count_by_status("Отчислен")
+            # Limit rows to avoid message too long
+            active_players = await repo.list_by_status("Активен", limit=20)
+            excluded_players = await repo.list_by_status("Отчислен", limit=10)
+
+    if not total_count:
         await message.answer("📭 Нет зарегистрированных игроков.")
         return
 
-    # Separate active and excluded players
-    active_players = [p for p in players if p.status == "Активен"]
-    excluded_players = [p for p in players if p.status == "Отчислен"]
-
-    response = f"👥 <b>Всего игроков: {len(players)}</b>\n\n"
+    parts: list[str] = [f"👥 <b>Всего игроков: {total_count}</b>\n\n"]
 
     if active_players:
-        response += f"✅ <b>Активные ({len(active_players)}):</b>\n"
-        for player in active_players[:20]:  # Limit to 20 to avoid message too long
-            response += f"• {player.nickname} ({player.username})\n"
-        if len(active_players) > 20:
-            response += f"... и еще {len(active_players) - 20}\n"
-        response += "\n"
+        parts.append(f"✅ <b>Активные ({active_count}):</b>\n")
+        parts.extend(f"• {player.nickname} ({player.username})\n" for player in active_players)
+        if active_count > len(active_players):
+            parts.append(f"... и еще {active_count - len(active_players)}\n")
+        parts.append("\n")
 
     if excluded_players:
-        response += f"❌ <b>Отчисленные ({len(excluded_players)}):</b>\n"
-        for player in excluded_players[:10]:
-            response += f"• {player.nickname} ({player.username})\n"
-        if len(excluded_players) > 10:
-            response += f"... и еще {len(excluded_players) - 10}\n"
+        parts.append(f"❌ <b>Отчисленные ({excluded_count}):</b>\n")
+        parts.extend(f"• {player.nickname} ({player.username})\n" for player in excluded_players)
+        if excluded_count > len(excluded_players):
+            parts.append(f"... и еще {excluded_count - len(excluded_players)}\n")
 
-    await message.answer(response)
+    await message.answer("".join(parts))
 
 
 @router.message(Command("approve"))
@@ -248,65 +250,52 @@ async def cmd_approve(message: Message, db: Database, settings: Settings) -> Non
     username = parts[1]
 
     # Normalize username
-    from utils.validators import normalize_username
-
     username = normalize_username(username)
 
-    async for session in db.get_session():
+    async with db.session() as session:
         repo = PlayerRepository(session)
 
-        # Find pending registration by username
-        pending = await repo.get_pending_by_username(username)
-        if not pending:
-            await message.answer(f"❌ Заявка от пользователя {username} не найдена.")
-            return
-
-        # Check if already registered
-        if await repo.check_player_exists(pending.telegram_id):
-            await message.answer(f"❌ Пользователь {username} уже зарегистрирован.")
-            await repo.remove_pending(pending.telegram_id)
-            return
-
-        # Convert pending to player
-        player = Player(
-            telegram_id=pending.telegram_id,
-            username=pending.username,
-            nickname=pending.nickname,
-            screenshot_path=pending.screenshot_path,
-            registration_date=datetime.now().strftime("%Y-%m-%d"),
-            status="Активен",
-            added_by=f"@{message.from_user.username or message.from_user.id}",
-            notes="Одобрено через команду /approve",
-        )
-
-        # Add to database
+        # Find the pending registration and move it to players in one go
         try:
-            await repo.add_player(player)
-            await repo.remove_pending(pending.telegram_id)
-            logger.info(f"Player {pending.username} approved by admin via command")
+            found, player = await repo.approve_pending_by_username(
+                username,
+                added_by=f"@{message.from_user.username or message.from_user.id}",
+                notes="Одобрено через команду /approve",
+            )
         except Exception as e:
+            await session.rollback()
             logger.error(f"Failed to approve player: {e}")
             await message.answer("❌ Ошибка при одобрении заявки.")
             return
 
+    if not found:
+        await message.answer(f"❌ Заявка от пользователя {username} не найдена.")
+        return
+
+    if player is None:
+        await message.answer(f"❌ Пользователь {username} уже зарегистрирован.")
+        return
+
+    logger.info(f"Player {username} approved by admin via command")
+
     # Notify user
-    try:
-        await message.bot.send_message(
-            chat_id=pending.telegram_id,
-            text=(
+    await notify_users(
+        message.bot,
+        [
+            (
+                player.telegram_id,
                 "🎉 <b>Поздравляем!</b>\n\n"
                 "Ваша заявка на вступление в телеграм группу клана одобрена!\n"
                 "Для входа нажмите сюда: <a href='https://t.me/+k_Alie0yCT8wODJi'>👉 ВХОД</a>\n"
-                f"Добро пожаловать, <b>{pending.nickname}</b>!"
-            ),
-        )
-    except Exception as e:
-        logger.warning(f"Failed to notify user {pending.telegram_id}: {e}")
+                f"Добро пожаловать, <b>{player.nickname}</b>!",
+            )
+        ],
+    )
 
     await message.answer(
         f"✅ Заявка одобрена!\n\n"
-        f"👤 Игрок: <b>{pending.nickname}</b> ({username})\n"
-        f"🆔 Telegram ID: <code>{pending.telegram_id}</code>"
+        f"👤 Игрок: <b>{player.nickname}</b> ({username})\n"
+        f"🆔 Telegram ID: <code>{player.telegram_id}</code>"
     )
 
 
@@ -338,16 +327,13 @@ async def cmd_exclude(message: Message, db: Database, settings: Settings) -> Non
     reason = parts[2]
 
     # Normalize username
-    from utils.validators import normalize_username
-
     username = normalize_username(username)
 
-    async for session in db.get_session():
+    async with db.session() as session:
         repo = PlayerRepository(session)
 
         # Find player by username
-        players = await repo.get_all_players()
-        player = next((p for p in players if p.username == username), None)
+        player = await repo.get_by_username(username)
 
         if not player:
             await message.answer(f"❌ Игрок {username} не найден в базе данных.")
@@ -363,22 +349,23 @@ async def cmd_exclude(message: Message, db: Database, settings: Settings) -> Non
             await repo.exclude_player(player.telegram_id, reason, excluded_by)
             logger.info(f"Player {username} excluded by {excluded_by}")
         except Exception as e:
+            await session.rollback()
             logger.error(f"Failed to exclude player: {e}")
             await message.answer("❌ Ошибка при отчислении игрока.")
             return
 
     # Notify player
-    try:
-        await message.bot.send_message(
-            chat_id=player.telegram_id,
-            text=(
+    await notify_users(
+        message.bot,
+        [
+            (
+                player.telegram_id,
                 f"❌ Вы были отчислены из клана.\n\n"
                 f"<b>Причина:</b> {reason}\n\n"
-                "Если у вас есть вопросы, обратитесь к администрации клана."
-            ),
-        )
-    except Exception as e:
-        logger.warning(f"Failed to notify excluded player {player.telegram_id}: {e}")
+                "Если у вас есть вопросы, обратитесь к администрации клана.",
+            )
+        ],
+    )
 
     await message.answer(
         f"✅ Игрок {player.nickname} ({username}) отчислен из клана.\n<b>Причина:</b> {reason}"
@@ -1,6 +1,7 @@
 """Common bot handlers (start, help, etc.)."""
 
 import logging
+from typing import Final
 
 from aiogram import Router
 from aiogram.filters import Command
@@ -10,44 +11,25 @@ from aiogram.types import Message
 router = Router()
 logger = logging.getLogger(__name__)
 
-
-@router.message(Command("start"))
-async def cmd_start(message: Message) -> None:
-    """
-    Handle /start command.
-
-    Args:
-        message: Incoming message
-    """
-    welcome_text = (
-        "🚩 <b>Добро пожаловать в клан The Born USSR!</b>\n"
-        "⚔️ <b>Kingdom Clash</b> - Регистрация бойцов\n\n"
-        "━━━━━━━━━━━━━━━━━━━━━━\n"
-        "📜 <b>ПРАВИЛА КЛАНА:</b>\n\n"
-        "1️⃣ Игроки с ником 'Player' автоматически исключаются\n"
-        "2️⃣ Обязательно добавьте к нику обозначение <b>TBU</b>\n"
-        "   <i>Пример: Гвардия TBU</i>\n"
-        "3️⃣ Обязательное участие в <b>Клановой Охоте (КО)</b> и <b>Клановой Битве (КБ)</b>\n"
-        "4️⃣ Минимум <b>80 кубков</b> из 20 боев на Арене ежедневно\n"
-        "5️⃣ Игроки с менее чем <b>4000 кубков</b> - кандидаты на вылет\n"
-        "6️⃣ Соблюдение правил общения и взаимоуважение\n"
-        "━━━━━━━━━━━━━━━━━━━━━━\n\n"
-        "⚠️ <b>Продолжая регистрацию, вы автоматически соглашаетесь с правилами клана.</b>\n\n"
-        "📝 Для регистрации используйте: /register\n"
-        "❓ Справка по командам: /help"
-    )
-    await message.answer(welcome_text)
-
-
-@router.message(Command("help"))
-async def cmd_help(message: Message) -> None:
-    """
-    Handle /help command.
-
-    Args:
-        message: Incoming message
-    """
-    help_text = """
+_START_TEXT: Final[str] = (
+    "🚩 <b>Добро пожаловать в клан The Born USSR!</b>\n"
+    "⚔️ <b>Kingdom Clash</b> - Регистрация бойцов\n\n"
+    "━━━━━━━━━━━━━━━━━━━━━━\n"
+    "📜 <b>ПРАВИЛА КЛАНА:</b>\n\n"
+    "1️⃣ Игроки с ником 'Player' автоматически исключаются\n"
+    "2️⃣ Обязательно добавьте к нику обозначение <b>TBU</b>\n"
+    "   <i>Пример: Гвардия TBU</i>\n"
+    "3️⃣ Обязательное участие в <b>Клановой Охоте (КО)</b> и <b>Клановой Битве (КБ)</b>\n"
+    "4️⃣ Минимум <b>80 кубков</b> из 20 боев на Арене ежедневно\n"
+    "5️⃣ Игроки с менее чем <b>4000 кубков</b> - кандидаты на вылет\n"
+    "6️⃣ Соблюдение правил общения и взаимоуважение\n"
+    "━━━━━━━━━━━━━━━━━━━━━━\n\n"
+    "⚠️ <b>Продолжая регистрацию, вы автоматически соглашаетесь с правилами клана.</b>\n\n"
+    "📝 Для регистрации используйте: /register\n"
+    "❓ Справка по командам: /help"
+)
+
+_HELP_TEXT: Final[str] = """
 📋 <b>Доступные команды:</b>
 
 <b>Для игроков:</b>
@@ -67,7 +49,28 @@ async def cmd_help(message: Message) -> None:
 3. Отправьте скриншот профиля в игре
 4. Дождитесь одобрения администратором
 """
-    await message.answer(help_text)
+
+
+@router.message(Command("start"))
+async def cmd_start(message: Message) -> None:
+    """
+    Handle /start command.
+
+    Args:
+        message: Incoming message
+    """
+    await message.answer(_START_TEXT)
+
+
+@router.message(Command("help"))
+async def cmd_help(message: Message) -> None:
+    """
+    Handle /help command.
+
+    Args:
+        message: Incoming message
+    """
+    await message.answer(_HELP_TEXT)
 
 
 @router.message(Command("cancel"))
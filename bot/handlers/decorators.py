@@ -13,6 +13,7 @@ def admin_only(handler: Callable) -> Callable:
 
     Works with both Message and CallbackQuery handlers.
     Automatically sends error message if user is not admin.
+    Settings must be passed as the ``settings`` keyword argument, as aiogram DI does.
 
     Args:
         handler: Handler function to wrap
@@ -29,19 +30,9 @@ def admin_only(handler: Callable) -> Callable:
 
     @wraps(handler)
     async def wrapper(event: Union[Message, CallbackQuery], *args, **kwargs):
-        # Extract settings from kwargs or args
-        # In aiogram DI, settings is passed as keyword argument
-        # In tests, it might be passed as positional argument
-        settings: Settings = kwargs.get("settings")
-
-        if not settings and args:
-            # Try to find Settings in args
-            for arg in args:
-                if isinstance(arg, Settings):
-                    settings = arg
-                    break
-
-        if not settings:
+        # aiogram DI always passes settings as a keyword argument
+        settings: Settings | None = kwargs.get("settings")
+        if settings is None:
             raise ValueError("Settings not found in handler arguments")
 
         # Get user_id from event
@@ -1,7 +1,10 @@
 """Handlers for player registration process."""
 
+import asyncio
 import logging
-from datetime import datetime
+import re
+import time
+from pathlib import Path
 
 from aiogram import F, Router
 from aiogram.filters import Command
@@ -14,11 +17,38 @@ from config.settings import Settings
 from database.database import Database
 from database.repository import PlayerRepository
 from models.player import PendingRegistration
-from utils.captcha import generate_captcha, get_captcha_explanation, get_captcha_keyboard_data
+from utils.captcha import (
+    generate_captcha,
+    get_captcha_explanation,
+    get_captcha_keyboard_data,
+    normalize_answer,
+)
+from utils.validators import validate_nickname
 
 router = Router()
 logger = logging.getLogger(__name__)
 
+CAPTCHA_CALLBACK_PATTERN = re.compile(r"^captcha:(.+)$", re.DOTALL)
+
+PENDING_EXISTS_TEXT = (
+    "⏳ Ваша заявка уже отправлена и ожидает рассмотрения.\n"
+    "Пожалуйста, дождитесь ответа от администратора."
+)
+
+
+async def _discard_download(download_task: asyncio.Task, local_path: str) -> None:
+    """
+    Stop a screenshot download and remove whatever part of the file was written.
+
+    Args:
+        download_task: Task running bot.download_file
+        local_path: Destination path of the download
+    """
+    download_task.cancel()
+    # Wait for the task to actually finish so it no longer writes to the file
+    await asyncio.gather(download_task, return_exceptions=True)
+    Path(local_path).unlink(missing_ok=True)
+
 
 @router.message(Command("register"))
 async def cmd_register(message: Message, state: FSMContext, db: Database) -> None:
@@ -31,11 +61,11 @@ async def cmd_register(message: Message, state: FSMContext, db: Database) -> Non
         db: Database instance from dispatcher
     """
 
-    # Check if user is already registered or has pending request
-    async for session in db.get_session():
+    # Check if user is already registered or waiting for review; a request
+    # submitted concurrently is still caught when the new one is saved
+    async with db.session() as session:
         repo = PlayerRepository(session)
 
-        # Check if already registered
         if await repo.check_player_exists(message.from_user.id):
             await message.answer(
                 "❌ Вы уже зарегистрированы в клане!\n"
@@ -43,21 +73,18 @@ async def cmd_register(message: Message, state: FSMContext, db: Database) -> Non
             )
             return
 
-        # Check if has pending request
-        pending = await repo.get_pending(message.from_user.id)
-        if pending:
-            await message.answer(
-                "⏳ Ваша заявка уже отправлена и ожидает рассмотрения.\n"
-                "Пожалуйста, дождитесь ответа от администратора."
-            )
+        if await repo.pending_exists(message.from_user.id):
+            await message.answer(PENDING_EXISTS_TEXT)
             return
 
     # Start registration process with captcha
     captcha = generate_captcha()
 
-    # Store captcha question in FSM data for validation
+    # Store captcha question in FSM data for validation, the answer is normalized once here
     await state.update_data(
-        captcha_question=captcha.question, captcha_answer=captcha.correct_answer
+        captcha_question=captcha.question,
+        captcha_answer=captcha.correct_answer,
+        captcha_answer_normalized=normalize_answer(captcha.correct_answer),
     )
 
     # Send captcha explanation
@@ -77,24 +104,29 @@ async def cmd_register(message: Message, state: FSMContext, db: Database) -> Non
     await state.set_state(RegistrationStates.waiting_for_captcha)
 
 
-@router.callback_query(RegistrationStates.waiting_for_captcha, F.data.startswith("captcha:"))
-async def process_captcha(callback: CallbackQuery, state: FSMContext) -> None:
+@router.callback_query(
+    RegistrationStates.waiting_for_captcha,
+    F.data.regexp(CAPTCHA_CALLBACK_PATTERN).as_("captcha_match"),
+)
+async def process_captcha(
+    callback: CallbackQuery, state: FSMContext, captcha_match: re.Match[str]
+) -> None:
     """
     Process captcha answer.
 
     Args:
         callback: Callback query with user's answer
         state: FSM context
+        captcha_match: Match of the callback data, group 1 is the chosen answer
     """
-    # Extract answer from callback data
-    user_answer = callback.data.split(":", 1)[1]
+    user_answer = captcha_match.group(1)
 
     # Get stored captcha data
     data = await state.get_data()
     correct_answer = data.get("captcha_answer", "")
 
     # Validate answer
-    if user_answer.lower().strip() == correct_answer.lower().strip():
+    if normalize_answer(user_answer) == data.get("captcha_answer_normalized"):
         # Correct answer - proceed to nickname input
         await callback.message.edit_text(
             f"✅ Правильно! {data.get('captcha_question', '')}\nОтвет: <b>{correct_answer}</b>"
@@ -136,8 +168,6 @@ async def process_nickname(message: Message, state: FSMContext) -> None:
         message: Incoming message with nickname
         state: FSM context
     """
-    from utils.validators import validate_nickname
-
     nickname = message.text.strip()
 
     # Validate nickname
@@ -188,13 +218,13 @@ async def process_screenshot(
     file_path = file.file_path
 
     # Generate unique filename
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
     local_filename = f"screenshot_{message.from_user.id}_{timestamp}.jpg"
     local_path = f"{settings.storage.screenshots_dir}/{local_filename}"
 
-    # Download file
-    await message.bot.download_file(file_path, local_path)
-    logger.info(f"Screenshot saved: {local_path}")
+    # Download file in the background while the pending registration is saved
+    # (aiogram streams it to disk in chunks)
+    download_task = asyncio.create_task(message.bot.download_file(file_path, local_path))
 
     # Create pending registration
     username = message.from_user.username or f"user_{message.from_user.id}"
@@ -209,19 +239,31 @@ async def process_screenshot(
     )
 
     # Save to database
-    async for session in db.get_session():
-        repo = PlayerRepository(session)
-        try:
-            await repo.save_pending(pending)
-            logger.info(f"Pending registration saved for {username}")
-        except Exception as e:
-            logger.error(f"Failed to save pending registration: {e}")
-            await message.answer(
-                "❌ Произошла ошибка при сохранении заявки. "
-                "Пожалуйста, попробуйте позже или обратитесь к администратору."
-            )
-            await state.clear()
-            return
+    try:
+        async with db.session() as session:
+            repo = PlayerRepository(session)
+            saved = await repo.save_pending(pending)
+            if saved is not None:
+                # Commit only once the screenshot the row points to is on disk;
+                # a failed download leaves the block early and nothing is committed
+                await download_task
+    except Exception as e:
+        await _discard_download(download_task, local_path)
+        logger.error(f"Failed to save pending registration: {e}")
+        await message.answer(
+            "❌ Произошла ошибка при сохранении заявки. "
+            "Пожалуйста, попробуйте позже или обратитесь к администратору."
+        )
+        await state.clear()
+        return
+
+    if saved is None:
+        await _discard_download(download_task, local_path)
+        await message.answer(PENDING_EXISTS_TEXT)
+        await state.clear()
+        return
+
+    logger.info(f"Pending registration saved for {username}, screenshot: {local_path}")
 
     # Send notification to admin
     admin_message = (
@@ -232,25 +274,28 @@ async def process_screenshot(
         f"📸 Скриншот прикреплен ниже."
     )
 
-    try:
-        # Send notification with screenshot to admin
-        await message.bot.send_photo(
+    # Notify admin and confirm to user concurrently
+    admin_result, user_result = await asyncio.gather(
+        message.bot.send_photo(
             chat_id=settings.telegram.leader_telegram_id,
             photo=file_id,
             caption=admin_message,
             reply_markup=get_approve_reject_keyboard(message.from_user.id),
-        )
-        logger.info(f"Admin notification sent for {username}")
-    except Exception as e:
-        logger.error(f"Failed to send admin notification: {e}")
-
-    # Confirm to user
-    await message.answer(
-        "✅ <b>Заявка отправлена!</b>\n\n"
-        "Ваша заявка успешно отправлена администратору клана.\n"
-        "Ожидайте одобрения. Вы получите уведомление, когда администратор рассмотрит вашу заявку.\n\n"
-        f"📝 Ваш никнейм: <b>{nickname}</b>"
+        ),
+        message.answer(
+            "✅ <b>Заявка отправлена!</b>\n\n"
+            "Ваша заявка успешно отправлена администратору клана.\n"
+            "Ожидайте одобрения. Вы получите уведомление, когда администратор рассмотрит вашу заявку.\n\n"
+            f"📝 Ваш никнейм: <b>{nickname}</b>"
+        ),
+        return_exceptions=True,
     )
+    if isinstance(admin_result, Exception):
+        logger.error(f"Failed to send admin notification: {admin_result}")
+    else:
+        logger.info(f"Admin notification sent for {username}")
+    if isinstance(user_result, Exception):
+        logger.error(f"Failed to confirm registration to {username}: {user_result}")
 
     # Clear FSM state
     await state.clear()
@@ -1,13 +1,32 @@
 """Admin keyboards for player management."""
 
+from functools import cache, lru_cache
+
+from aiogram.filters.callback_data import CallbackData
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 
+class ApproveCallback(CallbackData, prefix="approve"):
+    """Callback data for the approve button (packs as ``approve:<telegram_id>``)."""
+
+    telegram_id: int
+
+
+class RejectCallback(CallbackData, prefix="reject"):
+    """Callback data for the reject button (packs as ``reject:<telegram_id>``)."""
+
+    telegram_id: int
+
+
+@lru_cache(maxsize=1024)
 def get_approve_reject_keyboard(telegram_id: int) -> InlineKeyboardMarkup:
     """
     Create inline keyboard with approve/reject buttons for pending registration.
 
+    The markup depends only on telegram_id and is never modified after sending,
+    so it is cached and reused.
+
     Args:
         telegram_id: Telegram ID of the pending player
 
@@ -18,11 +37,11 @@ def get_approve_reject_keyboard(telegram_id: int) -> InlineKeyboardMarkup:
     builder.row(
         InlineKeyboardButton(
             text="✅ Одобрить",
-            callback_data=f"approve:{telegram_id}",
+            callback_data=ApproveCallback(telegram_id=telegram_id).pack(),
         ),
         InlineKeyboardButton(
             text="❌ Отклонить",
-            callback_data=f"reject:{telegram_id}",
+            callback_data=RejectCallback(telegram_id=telegram_id).pack(),
         ),
     )
     return builder.as_markup()
@@ -54,10 +73,13 @@ def get_player_management_keyboard(telegram_id: int) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cache
 def get_cancel_keyboard() -> InlineKeyboardMarkup:
     """
     Create inline keyboard with cancel button.
 
+    The markup never changes, so it is built once and reused.
+
     Returns:
         InlineKeyboardMarkup with cancel button
     """
@@ -2,15 +2,20 @@
 
 import logging
 import time
-from collections import defaultdict
 from collections.abc import Awaitable
-from typing import Any, Callable
+from typing import Any, Callable, Final
 
 from aiogram import BaseMiddleware
 from aiogram.types import Message, TelegramObject
 
 logger = logging.getLogger(__name__)
 
+# Flood warning is split around the only variable part, the seconds until reset
+_FLOOD_WARNING_PREFIX: Final[str] = "⏱ <b>Слишком много запросов!</b>\n\nПожалуйста, подождите <b>"
+_FLOOD_WARNING_SUFFIX: Final[str] = (
+    " сек.</b> перед следующей командой.\n\n<i>Это необходимо для защиты бота от перегрузки.</i>"
+)
+
 
 class RateLimitMiddleware(BaseMiddleware):
     """
@@ -22,56 +27,74 @@ class RateLimitMiddleware(BaseMiddleware):
     - https://bazucompany.com/blog/how-to-secure-a-telegram-bot-best-practices/
     """
 
+    # Drop state of idle users every N processed messages
+    GC_EVERY = 1024
+
     def __init__(
         self,
         rate_limit: int = 5,
         time_window: int = 60,
+        limited_prefixes: tuple[str, ...] = ("/",),
+        exempt_user_ids: frozenset[int] = frozenset(),
     ):
         """
         Initialize rate limiting middleware.
 
+        Each user gets a token bucket of rate_limit tokens refilled at
+        rate_limit / time_window per second, so bursts up to rate_limit are
+        allowed and the sustained rate is smooth with O(1) state per user.
+
         Args:
             rate_limit: Maximum number of requests allowed in time window
             time_window: Time window in seconds
+            limited_prefixes: Only messages whose text or caption starts with one
+                of these prefixes are rate limited (commands by default)
+            exempt_user_ids: Users that are never rate limited (e.g. the clan leader)
         """
         self.rate_limit = rate_limit
         self.time_window = time_window
-
-        # Storage: {user_id: [(timestamp1, timestamp2, ...)]}
-        self.user_timestamps: dict[int, list[float]] = defaultdict(list)
-
-    def _cleanup_old_timestamps(self, user_id: int, current_time: float) -> None:
-        """Remove timestamps older than time window."""
-        cutoff_time = current_time - self.time_window
-        self.user_timestamps[user_id] = [
-            ts for ts in self.user_timestamps[user_id] if ts > cutoff_time
-        ]
-
-    def _is_rate_limited(self, user_id: int) -> tuple[bool, int]:
+        self.limited_prefixes = limited_prefixes
+        self.exempt_user_ids = exempt_user_ids
+
+        # Token bucket storage: {user_id: (tokens, last_update)}
+        self.state: dict[int, tuple[float, float]] = {}
+        self.drip_rate = rate_limit / time_window
+        self._call_count = 0
+
+    def _tokens(self, user_id: int, current_time: float) -> float:
+        """Get number of tokens available to user, including refill since last request."""
+        entry = self.state.get(user_id)
+        if entry is None:
+            return float(self.rate_limit)
+        tokens, last_update = entry
+        return min(float(self.rate_limit), tokens + (current_time - last_update) * self.drip_rate)
+
+    def _is_rate_limited(self, user_id: int, current_time: float) -> tuple[bool, int]:
         """
         Check if user exceeded rate limit.
 
+        Args:
+            user_id: Telegram user ID
+            current_time: time.monotonic() value of the current request
+
         Returns:
             Tuple of (is_limited, seconds_until_reset)
         """
-        current_time = time.time()
-
-        # Clean up old timestamps
-        self._cleanup_old_timestamps(user_id, current_time)
-
-        timestamps = self.user_timestamps[user_id]
-
-        if len(timestamps) >= self.rate_limit:
-            # User exceeded rate limit
-            oldest_timestamp = min(timestamps)
-            seconds_until_reset = int(self.time_window - (current_time - oldest_timestamp)) + 1
-            return True, seconds_until_reset
-
+        tokens = self._tokens(user_id, current_time)
+        if tokens < 1:
+            # Time until the bucket refills to one whole token
+            return True, int((1 - tokens) / self.drip_rate) + 1
         return False, 0
 
-    def _record_request(self, user_id: int) -> None:
-        """Record new request timestamp for user."""
-        self.user_timestamps[user_id].append(time.time())
+    def _gc(self, current_time: float) -> None:
+        """Forget users whose bucket has refilled completely."""
+        for user_id in list(self.state):
+            if self._tokens(user_id, current_time) >= self.rate_limit:
+                del self.state[user_id]
+
+    def _record_request(self, user_id: int, current_time: float) -> None:
+        """Take one token from user's bucket at current_time (time.monotonic())."""
+        self.state[user_id] = (self._tokens(user_id, current_time) - 1, current_time)
 
     async def __call__(
         self,
@@ -84,14 +107,28 @@ class RateLimitMiddleware(BaseMiddleware):
         if not isinstance(event, Message):
             return await handler(event, data)
 
+        # Skip plain text and media (e.g. registration answers and screenshots)
+        text = event.text or event.caption or ""
+        if not text.startswith(self.limited_prefixes):
+            return await handler(event, data)
+
         user = event.from_user
         if not user:
             return await handler(event, data)
 
         user_id = user.id
+        if user_id in self.exempt_user_ids:
+            return await handler(event, data)
+
+        # Only relative time matters here, so use the monotonic clock once per message
+        current_time = time.monotonic()
+
+        self._call_count += 1
+        if self._call_count % self.GC_EVERY == 0:
+            self._gc(current_time)
 
         # Check if user is rate limited
-        is_limited, seconds_until_reset = self._is_rate_limited(user_id)
+        is_limited, seconds_until_reset = self._is_rate_limited(user_id, current_time)
 
         if is_limited:
             logger.warning(
@@ -99,15 +136,12 @@ class RateLimitMiddleware(BaseMiddleware):
                 f"Reset in {seconds_until_reset}s"
             )
             await event.answer(
-                f"⏱ <b>Слишком много запросов!</b>\n\n"
-                f"Пожалуйста, подождите <b>{seconds_until_reset} сек.</b> "
-                f"перед следующей командой.\n\n"
-                f"<i>Это необходимо для защиты бота от перегрузки.</i>"
+                _FLOOD_WARNING_PREFIX + str(seconds_until_reset) + _FLOOD_WARNING_SUFFIX
             )
             return None
 
         # Record this request
-        self._record_request(user_id)
+        self._record_request(user_id, current_time)
 
         # Continue processing
         return await handler(event, data)
@@ -7,6 +7,10 @@ class DatabaseConfig(BaseModel):
     """PostgreSQL database configuration."""
 
     database_url: str = Field(..., description="PostgreSQL connection URL")
+    pool_size: int = Field(default=10, description="Persistent connections kept in the pool")
+    max_overflow: int = Field(default=20, description="Extra connections allowed under load")
+    pool_timeout: int = Field(default=30, description="Seconds to wait for a free connection")
+    pool_recycle: int = Field(default=1800, description="Seconds before a connection is replaced")
 
     @field_validator("database_url")
     @classmethod
@@ -1,10 +1,17 @@
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 from pydantic import BaseModel, Field, field_validator
 
 
+@lru_cache(maxsize=1)
+def _parse_credentials(credentials: str) -> dict:
+    """Parse credentials JSON string (cached, credentials don't change at runtime)."""
+    return json.loads(credentials)
+
+
 class GoogleSheetsConfig(BaseModel):
     """Google Sheets API configuration."""
 
@@ -25,7 +32,11 @@ class GoogleSheetsConfig(BaseModel):
         return v
 
     def get_credentials_path(self, base_dir: Path) -> Optional[Path]:
-        """Get path to credentials.json file."""
+        """
+        Get path to credentials.json file.
+
+        The file is not checked for existence, get_credentials_dict() handles a missing file.
+        """
         if self.credentials:
             return None  # Will use credentials string
 
@@ -36,7 +47,7 @@ class GoogleSheetsConfig(BaseModel):
         if not creds_path.is_absolute():
             creds_path = base_dir / creds_path
 
-        return creds_path if creds_path.exists() else None
+        return creds_path
 
     def get_credentials_dict(self, base_dir: Path) -> Optional[dict]:
         """
@@ -49,14 +60,17 @@ class GoogleSheetsConfig(BaseModel):
         # From environment variable
         if self.credentials:
             try:
-                return json.loads(self.credentials)
+                return _parse_credentials(self.credentials)
             except json.JSONDecodeError:
                 raise ValueError("GOOGLE_CREDENTIALS contains invalid JSON") from None
 
         # From file
         creds_path = self.get_credentials_path(base_dir)
-        if creds_path and creds_path.exists():
-            with open(creds_path) as f:
-                return json.load(f)
+        if creds_path is None:
+            return None
 
-        return None
+        try:
+            with open(creds_path, "rb") as f:
+                return json.loads(f.read())
+        except FileNotFoundError:
+            return None
@@ -1,5 +1,7 @@
 import os
+from functools import lru_cache
 from pathlib import Path
+from typing import Final
 
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field, field_validator
@@ -7,11 +9,11 @@ from pydantic import BaseModel, Field, field_validator
 from config.database import DatabaseConfig
 from config.storage import StorageConfig
 
-# Load environment variables
-load_dotenv()
-
 # Project root directory
-BASE_DIR = Path(__file__).resolve().parent.parent
+BASE_DIR: Final[Path] = Path(__file__).resolve().parent.parent
+
+# Load environment variables (explicit path skips find_dotenv()'s directory walk)
+load_dotenv(BASE_DIR / ".env")
 
 
 class TelegramConfig(BaseModel):
@@ -60,8 +62,14 @@ class Settings(BaseModel):
         arbitrary_types_allowed = True
 
 
+@lru_cache(maxsize=1)
 def load_settings() -> Settings:
-    """Load and validate settings from environment."""
+    """
+    Load and validate settings from environment.
+
+    The result is cached, repeated calls return the same instance.
+    Use reload_settings() to re-read the environment.
+    """
     try:
         settings = Settings(
             telegram=TelegramConfig(
@@ -70,10 +78,13 @@ def load_settings() -> Settings:
             ),
             database=DatabaseConfig(
                 database_url=os.getenv("DATABASE_URL", ""),
+                pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+                max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
             ),
             storage=StorageConfig(
                 screenshots_dir=os.getenv("SCREENSHOTS_DIR", "data/screenshots"),
                 temp_storage_file=os.getenv("TEMP_STORAGE_FILE", "data/pending.json"),
+                redis_url=os.getenv("REDIS_URL") or None,
             ),
             logging=LoggingConfig(
                 log_level=os.getenv("LOG_LEVEL", "INFO"),
@@ -86,3 +97,9 @@ def load_settings() -> Settings:
 
     except ValueError as e:
         raise ValueError(f"Configuration error: {e}") from e
+
+
+def reload_settings() -> Settings:
+    """Drop cached settings and load them from environment again."""
+    load_settings.cache_clear()
+    return load_settings()
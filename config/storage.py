@@ -1,27 +1,35 @@
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 from pydantic import BaseModel, Field
 
 
+@lru_cache(maxsize=4)
+def _resolve_path(path: str, base_dir: Path) -> Path:
+    """Resolve path relative to base_dir unless it is already absolute."""
+    resolved = Path(path)
+    if not resolved.is_absolute():
+        resolved = base_dir / resolved
+    return resolved
+
+
 class StorageConfig(BaseModel):
     """Storage configuration for files and data."""
 
     screenshots_dir: str = Field(default="data/screenshots")
     temp_storage_file: str = Field(default="data/pending.json")
+    redis_url: Optional[str] = Field(
+        default=None, description="Redis URL for FSM storage (in-memory if not set)"
+    )
 
     def get_screenshots_path(self, base_dir: Path) -> Path:
         """Get absolute path to screenshots directory."""
-        path = Path(self.screenshots_dir)
-        if not path.is_absolute():
-            path = base_dir / path
-        return path
+        return _resolve_path(self.screenshots_dir, base_dir)
 
     def get_temp_storage_path(self, base_dir: Path) -> Path:
         """Get absolute path to temp storage file."""
-        path = Path(self.temp_storage_file)
-        if not path.is_absolute():
-            path = base_dir / path
-        return path
+        return _resolve_path(self.temp_storage_file, base_dir)
 
     def ensure_directories(self, base_dir: Path):
         """Create necessary directories if they don't exist."""
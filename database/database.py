@@ -1,8 +1,11 @@
 """Database connection and session management with dependency injection."""
 
+import asyncio
 import logging
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
+from sqlalchemy import event, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
@@ -10,11 +13,20 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, StaticPool
 
 from database.models import Base
 
 logger = logging.getLogger(__name__)
 
+# WAL with synchronous=NORMAL fsyncs at checkpoints instead of on every commit
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
 
 class Database:
     """Database manager with dependency injection support."""
@@ -25,6 +37,9 @@ class Database:
         echo: bool = False,
         pool_size: int = 5,
         max_overflow: int = 10,
+        pool_recycle: int = 1800,
+        pool_timeout: int = 30,
+        sqlite_wal: bool = False,
     ):
         """
         Initialize database manager.
@@ -34,11 +49,20 @@ class Database:
             echo: Whether to echo SQL statements to logs
             pool_size: Connection pool size
             max_overflow: Max connections beyond pool_size
+            pool_recycle: Seconds after which a pooled connection is replaced,
+                so the server never drops idle connections under us
+            pool_timeout: Seconds to wait for a free connection before failing
+            sqlite_wal: Whether to switch file-backed SQLite connections to WAL
+                with relaxed fsync (for local runs and tests, not durable storage)
         """
         self.database_url = database_url
+        self.driver = "sqlite" if database_url.startswith("sqlite") else "asyncpg"
         self.echo = echo
         self.pool_size = pool_size
         self.max_overflow = max_overflow
+        self.pool_recycle = pool_recycle
+        self.pool_timeout = pool_timeout
+        self.sqlite_wal = sqlite_wal
         self._engine: AsyncEngine | None = None
         self._session_factory: async_sessionmaker[AsyncSession] | None = None
 
@@ -66,17 +90,40 @@ class Database:
             # Build engine kwargs
             engine_kwargs = {"echo": self.echo}
 
-            # Only add pool settings for non-SQLite databases
-            if not self.database_url.startswith("sqlite"):
+            if self.database_url.endswith(":memory:"):
+                # One shared connection, otherwise every checkout sees an empty database
+                engine_kwargs["poolclass"] = StaticPool
+            elif self.driver == "sqlite":
+                # File connections are local and cheap to open; a pool would only add locking
+                engine_kwargs["poolclass"] = NullPool
+            else:
                 engine_kwargs.update(
                     {
+                        "poolclass": AsyncAdaptedQueuePool,
                         "pool_pre_ping": True,  # Verify connections before using
+                        "pool_use_lifo": True,  # Reuse the most recently returned connection
                         "pool_size": self.pool_size,
                         "max_overflow": self.max_overflow,
+                        "pool_recycle": self.pool_recycle,
+                        "pool_timeout": self.pool_timeout,
                     }
                 )
 
+            if self.driver == "asyncpg":
+                engine_kwargs["connect_args"] = {
+                    # JIT compilation only slows down short OLTP queries
+                    "server_settings": {"jit": "off"},
+                    "statement_cache_size": 1024,
+                }
+
             self._engine = create_async_engine(self.database_url, **engine_kwargs)
+            # In-memory databases have no journal file to switch
+            if (
+                self.sqlite_wal
+                and self.driver == "sqlite"
+                and not self.database_url.endswith(":memory:")
+            ):
+                self._install_sqlite_pragmas()
             logger.info("Database engine initialized successfully")
 
             self._session_factory = async_sessionmaker(
@@ -91,6 +138,16 @@ class Database:
             logger.error(f"Failed to initialize database: {e}")
             raise
 
+    def _install_sqlite_pragmas(self) -> None:
+        """Apply _SQLITE_PRAGMAS to every new SQLite connection."""
+
+        @event.listens_for(self.engine.sync_engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in _SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+            cursor.close()
+
     async def create_tables(self) -> None:
         """Create all database tables."""
         try:
@@ -101,6 +158,27 @@ class Database:
             logger.error(f"Failed to create database tables: {e}")
             raise
 
+    async def warm_up(self) -> None:
+        """
+        Open pool_size connections up front so early handlers skip connection setup.
+
+        Does nothing for SQLite, whose connections are local and cheap to open.
+        """
+        if self.driver == "sqlite":
+            return
+
+        async def ping() -> None:
+            async with self.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        try:
+            # Hold all connections at once so the pool really opens pool_size of them
+            await asyncio.gather(*(ping() for _ in range(self.pool_size)))
+            logger.info(f"Connection pool warmed up with {self.pool_size} connections")
+        except Exception as e:
+            logger.error(f"Failed to warm up connection pool: {e}")
+            raise
+
     async def drop_tables(self) -> None:
         """Drop all database tables. Use with caution!"""
         try:
@@ -119,12 +197,15 @@ class Database:
             self._session_factory = None
             logger.info("Database engine closed")
 
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
         """
-        Async generator that yields database sessions.
+        Async context manager that provides a database session.
+
+        Commits when the block exits normally and rolls back on a database error.
 
         Usage:
-            async for session in db.get_session():
+            async with db.session() as session:
                 # Use session here
                 pass
 
@@ -139,21 +220,20 @@ class Database:
                 await session.rollback()
                 logger.error(f"Database session error: {e}")
                 raise
-            finally:
-                await session.close()
 
 
-def create_database(database_url: str, echo: bool = False) -> Database:
+def create_database(database_url: str, echo: bool = False, **pool_kwargs: int) -> Database:
     """
     Factory function to create and initialize a Database instance.
 
     Args:
         database_url: Database connection URL
         echo: Whether to echo SQL statements to logs
+        **pool_kwargs: pool_size, max_overflow, pool_timeout, pool_recycle
 
     Returns:
         Initialized Database instance
     """
-    db = Database(database_url, echo=echo)
+    db = Database(database_url, echo=echo, **pool_kwargs)
     db.init()
     return db
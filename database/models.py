@@ -20,14 +20,14 @@ class Player(Base):
     __tablename__ = "players"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    telegram_id: Mapped[int] = mapped_column(BIGINT, unique=True, nullable=False, index=True)
+    telegram_id: Mapped[int] = mapped_column(BIGINT, unique=True, nullable=False)
     username: Mapped[str] = mapped_column(VARCHAR(255), nullable=False, index=True)
     nickname: Mapped[str] = mapped_column(VARCHAR(100), nullable=False)
     screenshot_path: Mapped[Optional[str]] = mapped_column(VARCHAR(500), nullable=True)
     registration_date: Mapped[datetime] = mapped_column(
         TIMESTAMP, server_default=func.current_timestamp(), nullable=False
     )
-    status: Mapped[str] = mapped_column(VARCHAR(50), default="Активен", nullable=False, index=True)
+    status: Mapped[str] = mapped_column(VARCHAR(50), default="Активен", nullable=False)
     added_by: Mapped[str] = mapped_column(VARCHAR(255), default="bot", nullable=False)
     exclusion_date: Mapped[Optional[datetime]] = mapped_column(TIMESTAMP, nullable=True)
     exclusion_reason: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -44,9 +44,10 @@ class Player(Base):
     )
 
     __table_args__ = (
-        Index("idx_players_telegram_id", "telegram_id"),
         Index("idx_players_username", "username"),
-        Index("idx_players_status", "status"),
+        Index("idx_players_status_id", "status", "id"),
+        # get_excluded_players(): equality on status, then read backwards by exclusion_date
+        Index("idx_players_status_exclusion", "status", "exclusion_date"),
     )
 
     def __repr__(self) -> str:
@@ -59,7 +60,7 @@ class PendingRegistration(Base):
     __tablename__ = "pending_registrations"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    telegram_id: Mapped[int] = mapped_column(BIGINT, unique=True, nullable=False, index=True)
+    telegram_id: Mapped[int] = mapped_column(BIGINT, unique=True, nullable=False)
     username: Mapped[str] = mapped_column(VARCHAR(255), nullable=False, index=True)
     nickname: Mapped[str] = mapped_column(VARCHAR(100), nullable=False)
     screenshot_path: Mapped[str] = mapped_column(VARCHAR(500), nullable=False)
@@ -67,10 +68,7 @@ class PendingRegistration(Base):
         TIMESTAMP, server_default=func.current_timestamp(), nullable=False
     )
 
-    __table_args__ = (
-        Index("idx_pending_telegram_id", "telegram_id"),
-        Index("idx_pending_username", "username"),
-    )
+    __table_args__ = (Index("idx_pending_username", "username"),)
 
     def __repr__(self) -> str:
         return f"<PendingRegistration(id={self.id}, telegram_id={self.telegram_id}, username={self.username})>"
@@ -1,9 +1,26 @@
 """Repository layer for database operations."""
 
 import logging
+from collections.abc import AsyncIterator
+from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    Select,
+    bindparam,
+    delete,
+    exists,
+    func,
+    insert,
+    lambda_stmt,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -13,9 +30,39 @@ from models.player import PendingRegistration, Player
 
 logger = logging.getLogger(__name__)
 
+# Hot lookups are built once as lambda statements, so each call reuses the cached
+# compiled SQL without recomputing the statement's cache key
+_GET_PLAYER = lambda_stmt(
+    lambda: select(PlayerModel).where(PlayerModel.telegram_id == bindparam("telegram_id"))
+)
+_PLAYER_EXISTS = lambda_stmt(
+    lambda: select(exists().where(PlayerModel.telegram_id == bindparam("telegram_id")))
+)
+_PENDING_EXISTS = lambda_stmt(
+    lambda: select(exists().where(PendingRegistrationModel.telegram_id == bindparam("telegram_id")))
+)
+_GET_PENDING = lambda_stmt(
+    lambda: select(PendingRegistrationModel).where(
+        PendingRegistrationModel.telegram_id == bindparam("telegram_id")
+    )
+)
+_GET_PENDING_BY_USERNAME = lambda_stmt(
+    lambda: select(PendingRegistrationModel).where(
+        PendingRegistrationModel.username == bindparam("username")
+    )
+)
+# INSERTs take their values as execute() parameters, so one statement object serves every call
+_INSERT_PLAYER = insert(PlayerModel)
+_INSERT_PLAYER_RETURNING = _INSERT_PLAYER.returning(PlayerModel)
+
 
 class PlayerRepository:
-    """Repository for player-related database operations."""
+    """
+    Repository for player-related database operations.
+
+    Methods never flush or commit: each write is a single statement, and the
+    Database.session() block that owns the session commits once per handler.
+    """
 
     def __init__(self, session: AsyncSession):
         """
@@ -40,26 +87,50 @@ class PlayerRepository:
             IntegrityError: If player with telegram_id already exists
         """
         try:
-            db_player = PlayerModel(
-                telegram_id=player.telegram_id,
-                username=player.username,
-                nickname=player.nickname,
-                screenshot_path=player.screenshot_path,
-                status=player.status,
-                added_by=player.added_by,
-                notes=player.notes,
+            # RETURNING brings back server defaults without a refresh() round trip
+            db_player = await self.session.scalar(
+                _INSERT_PLAYER_RETURNING, self._player_values(player)
             )
-            self.session.add(db_player)
-            await self.session.flush()
-            await self.session.refresh(db_player)
 
-            logger.info(f"Added player: {player.username} (telegram_id={player.telegram_id})")
+            logger.info("Added player: %s (telegram_id=%s)", player.username, player.telegram_id)
             return self._to_dataclass(db_player)
         except IntegrityError:
-            logger.error(f"Player already exists: {player.telegram_id}")
+            logger.error("Player already exists: %s", player.telegram_id)
+            raise
+        except SQLAlchemyError as e:
+            logger.error("Failed to add player: %s", e)
+            raise
+
+    async def add_players(self, players: list[Player]) -> int:
+        """
+        Add several players in one executemany INSERT.
+
+        Skips the ORM unit of work; intended for bulk imports.
+
+        Args:
+            players: Player dataclass instances
+
+        Returns:
+            Number of inserted players
+
+        Raises:
+            IntegrityError: If any telegram_id already exists
+        """
+        if not players:
+            return 0
+
+        try:
+            await self.session.execute(
+                _INSERT_PLAYER, [self._player_values(player) for player in players]
+            )
+
+            logger.info("Added %s players", len(players))
+            return len(players)
+        except IntegrityError:
+            logger.error("Bulk insert failed: some players already exist")
             raise
         except SQLAlchemyError as e:
-            logger.error(f"Failed to add player: {e}")
+            logger.error("Failed to add players: %s", e)
             raise
 
     async def get_player(self, telegram_id: int) -> Optional[Player]:
@@ -73,7 +144,28 @@ class PlayerRepository:
             Player dataclass or None if not found
         """
         try:
-            stmt = select(PlayerModel).where(PlayerModel.telegram_id == telegram_id)
+            result = await self.session.execute(_GET_PLAYER, {"telegram_id": telegram_id})
+            db_player = result.scalar_one_or_none()
+
+            return self._to_dataclass(db_player) if db_player else None
+        except SQLAlchemyError as e:
+            logger.error("Failed to get player %s: %s", telegram_id, e)
+            raise
+
+    async def get_by_username(self, username: str) -> Optional[Player]:
+        """
+        Get player by username.
+
+        Uses the idx_players_username index instead of scanning all players.
+
+        Args:
+            username: Telegram username (with @ prefix)
+
+        Returns:
+            Player dataclass or None if not found
+        """
+        try:
+            stmt = select(PlayerModel).where(PlayerModel.username == username).limit(1)
             result = await self.session.execute(stmt)
             db_player = result.scalar_one_or_none()
 
@@ -81,7 +173,7 @@ class PlayerRepository:
                 return self._to_dataclass(db_player)
             return None
         except SQLAlchemyError as e:
-            logger.error(f"Failed to get player {telegram_id}: {e}")
+            logger.error("Failed to get player by username %s: %s", username, e)
             raise
 
     async def check_player_exists(self, telegram_id: int) -> bool:
@@ -94,24 +186,83 @@ class PlayerRepository:
         Returns:
             True if player exists, False otherwise
         """
-        player = await self.get_player(telegram_id)
-        return player is not None
+        try:
+            return bool(await self.session.scalar(_PLAYER_EXISTS, {"telegram_id": telegram_id}))
+        except SQLAlchemyError as e:
+            logger.error("Failed to check player %s: %s", telegram_id, e)
+            raise
+
+    async def get_all_players(self, batch_size: int = 500) -> AsyncIterator[Player]:
+        """
+        Stream all players from database.
+
+        Rows are fetched from the server in batches of ``batch_size``.
+
+        Args:
+            batch_size: Number of rows fetched per round trip
+
+        Yields:
+            Player dataclasses, newest first
+        """
+        try:
+            stmt = (
+                select(PlayerModel)
+                .order_by(PlayerModel.created_at.desc())
+                .execution_options(yield_per=batch_size)
+            )
+            result = await self.session.stream_scalars(stmt)
+            async for db_player in result:
+                yield self._to_dataclass(db_player)
+        except SQLAlchemyError as e:
+            logger.error("Failed to get all players: %s", e)
+            raise
+
+    async def count_by_status(self, status: Optional[str] = None) -> int:
+        """
+        Count players, optionally filtered by status.
+
+        Args:
+            status: Player status to filter by, or None to count all players
+
+        Returns:
+            Number of matching players
+        """
+        try:
+            stmt = select(func.count()).select_from(PlayerModel)
+            if status is not None:
+                stmt = stmt.where(PlayerModel.status == status)
+            result = await self.session.execute(stmt)
+            return result.scalar_one()
+        except SQLAlchemyError as e:
+            logger.error("Failed to count players with status %s: %s", status, e)
+            raise
 
-    async def get_all_players(self) -> list[Player]:
+    async def list_by_status(self, status: str, limit: int, offset: int = 0) -> list[Player]:
         """
-        Get all players from database.
+        Get a page of players with the given status, newest first.
+
+        Args:
+            status: Player status to filter by
+            limit: Maximum number of players to return
+            offset: Number of players to skip
 
         Returns:
             List of Player dataclasses
         """
         try:
-            stmt = select(PlayerModel).order_by(PlayerModel.created_at.desc())
+            stmt = (
+                select(PlayerModel)
+                .where(PlayerModel.status == status)
+                .order_by(PlayerModel.id.desc())
+                .limit(limit)
+                .offset(offset)
+            )
             result = await self.session.execute(stmt)
             db_players = result.scalars().all()
 
             return [self._to_dataclass(p) for p in db_players]
         except SQLAlchemyError as e:
-            logger.error(f"Failed to get all players: {e}")
+            logger.error("Failed to list players with status %s: %s", status, e)
             raise
 
     async def update_player_status(self, telegram_id: int, status: str) -> bool:
@@ -126,18 +277,19 @@ class PlayerRepository:
             True if updated, False if player not found
         """
         try:
-            stmt = select(PlayerModel).where(PlayerModel.telegram_id == telegram_id)
-            result = await self.session.execute(stmt)
-            db_player = result.scalar_one_or_none()
+            stmt = (
+                update(PlayerModel)
+                .where(PlayerModel.telegram_id == telegram_id)
+                .values(status=status)
+                .returning(PlayerModel.id)
+            )
+            if await self.session.scalar(stmt) is None:
+                return False
 
-            if db_player:
-                db_player.status = status
-                await self.session.flush()
-                logger.info(f"Updated player {telegram_id} status to {status}")
-                return True
-            return False
+            logger.info("Updated player %s status to %s", telegram_id, status)
+            return True
         except SQLAlchemyError as e:
-            logger.error(f"Failed to update player {telegram_id} status: {e}")
+            logger.error("Failed to update player %s status: %s", telegram_id, e)
             raise
 
     async def exclude_player(self, telegram_id: int, reason: str, excluded_by: str) -> bool:
@@ -153,79 +305,90 @@ class PlayerRepository:
             True if excluded, False if player not found
         """
         try:
-            stmt = select(PlayerModel).where(PlayerModel.telegram_id == telegram_id)
-            result = await self.session.execute(stmt)
-            db_player = result.scalar_one_or_none()
+            stmt = (
+                update(PlayerModel)
+                .where(PlayerModel.telegram_id == telegram_id)
+                .values(
+                    status="Отчислен",
+                    exclusion_date=func.now(),
+                    exclusion_reason=reason,
+                    excluded_by=excluded_by,
+                )
+                .returning(PlayerModel.id)
+            )
+            if await self.session.scalar(stmt) is None:
+                return False
 
-            if db_player:
-                from datetime import datetime
-
-                db_player.status = "Отчислен"
-                db_player.exclusion_date = datetime.now()
-                db_player.exclusion_reason = reason
-                db_player.excluded_by = excluded_by
-                await self.session.flush()
-                logger.info(f"Excluded player {telegram_id}: {reason}")
-                return True
-            return False
+            logger.info("Excluded player %s: %s", telegram_id, reason)
+            return True
         except SQLAlchemyError as e:
-            logger.error(f"Failed to exclude player {telegram_id}: {e}")
+            logger.error("Failed to exclude player %s: %s", telegram_id, e)
             raise
 
-    async def get_excluded_players(self) -> list[Player]:
+    async def get_excluded_players(self, batch_size: int = 500) -> AsyncIterator[Player]:
         """
-        Get all excluded players from database.
+        Stream all excluded players from database.
 
-        Returns:
-            List of Player dataclasses with status "Отчислен"
+        Rows are fetched from the server in batches of ``batch_size``.
+
+        Args:
+            batch_size: Number of rows fetched per round trip
+
+        Yields:
+            Player dataclasses with status "Отчислен", most recently excluded first
         """
         try:
             stmt = (
                 select(PlayerModel)
                 .where(PlayerModel.status == "Отчислен")
                 .order_by(PlayerModel.exclusion_date.desc())
+                .execution_options(yield_per=batch_size)
             )
-            result = await self.session.execute(stmt)
-            db_players = result.scalars().all()
-
-            return [self._to_dataclass(p) for p in db_players]
+            result = await self.session.stream_scalars(stmt)
+            async for db_player in result:
+                yield self._to_dataclass(db_player)
         except SQLAlchemyError as e:
-            logger.error(f"Failed to get excluded players: {e}")
+            logger.error("Failed to get excluded players: %s", e)
             raise
 
-    async def save_pending(self, pending: PendingRegistration) -> PendingRegistration:
+    async def save_pending(self, pending: PendingRegistration) -> Optional[PendingRegistration]:
         """
         Save a pending registration request.
 
+        Uses INSERT ... ON CONFLICT DO NOTHING, so an existing request for the
+        same telegram_id is left untouched without raising.
+
         Args:
             pending: PendingRegistration dataclass instance
 
         Returns:
-            PendingRegistration dataclass with database ID
-
-        Raises:
-            IntegrityError: If pending registration already exists
+            PendingRegistration dataclass with database ID,
+            or None if a pending registration already exists
         """
         try:
-            db_pending = PendingRegistrationModel(
-                telegram_id=pending.telegram_id,
-                username=pending.username,
-                nickname=pending.nickname,
-                screenshot_path=pending.screenshot_path,
+            dialect_insert = (
+                sqlite_insert if self.session.get_bind().dialect.name == "sqlite" else pg_insert
+            )
+            stmt = (
+                dialect_insert(PendingRegistrationModel)
+                .values(self._pending_values(pending))
+                .on_conflict_do_nothing(index_elements=["telegram_id"])
+                .returning(PendingRegistrationModel)
             )
-            self.session.add(db_pending)
-            await self.session.flush()
-            await self.session.refresh(db_pending)
+            db_pending = await self.session.scalar(stmt)
+
+            if db_pending is None:
+                logger.info("Pending registration already exists: %s", pending.telegram_id)
+                return None
 
             logger.info(
-                f"Saved pending registration: {pending.username} (telegram_id={pending.telegram_id})"
+                "Saved pending registration: %s (telegram_id=%s)",
+                pending.username,
+                pending.telegram_id,
             )
             return self._pending_to_dataclass(db_pending)
-        except IntegrityError:
-            logger.error(f"Pending registration already exists: {pending.telegram_id}")
-            raise
         except SQLAlchemyError as e:
-            logger.error(f"Failed to save pending registration: {e}")
+            logger.error("Failed to save pending registration: %s", e)
             raise
 
     async def get_pending(self, telegram_id: int) -> Optional[PendingRegistration]:
@@ -239,17 +402,30 @@ class PlayerRepository:
             PendingRegistration dataclass or None if not found
         """
         try:
-            stmt = select(PendingRegistrationModel).where(
-                PendingRegistrationModel.telegram_id == telegram_id
-            )
-            result = await self.session.execute(stmt)
+            result = await self.session.execute(_GET_PENDING, {"telegram_id": telegram_id})
             db_pending = result.scalar_one_or_none()
 
             if db_pending:
                 return self._pending_to_dataclass(db_pending)
             return None
         except SQLAlchemyError as e:
-            logger.error(f"Failed to get pending registration {telegram_id}: {e}")
+            logger.error("Failed to get pending registration %s: %s", telegram_id, e)
+            raise
+
+    async def pending_exists(self, telegram_id: int) -> bool:
+        """
+        Check if a pending registration exists.
+
+        Args:
+            telegram_id: Telegram user ID
+
+        Returns:
+            True if a pending registration exists, False otherwise
+        """
+        try:
+            return bool(await self.session.scalar(_PENDING_EXISTS, {"telegram_id": telegram_id}))
+        except SQLAlchemyError as e:
+            logger.error("Failed to check pending registration %s: %s", telegram_id, e)
             raise
 
     async def get_pending_by_username(self, username: str) -> Optional[PendingRegistration]:
@@ -263,17 +439,14 @@ class PlayerRepository:
             PendingRegistration dataclass or None if not found
         """
         try:
-            stmt = select(PendingRegistrationModel).where(
-                PendingRegistrationModel.username == username
-            )
-            result = await self.session.execute(stmt)
+            result = await self.session.execute(_GET_PENDING_BY_USERNAME, {"username": username})
             db_pending = result.scalar_one_or_none()
 
             if db_pending:
                 return self._pending_to_dataclass(db_pending)
             return None
         except SQLAlchemyError as e:
-            logger.error(f"Failed to get pending registration by username {username}: {e}")
+            logger.error("Failed to get pending registration by username %s: %s", username, e)
             raise
 
     async def remove_pending(self, telegram_id: int) -> bool:
@@ -287,22 +460,150 @@ class PlayerRepository:
             True if removed, False if not found
         """
         try:
-            stmt = select(PendingRegistrationModel).where(
-                PendingRegistrationModel.telegram_id == telegram_id
+            stmt = (
+                delete(PendingRegistrationModel)
+                .where(PendingRegistrationModel.telegram_id == telegram_id)
+                .returning(PendingRegistrationModel.id)
             )
-            result = await self.session.execute(stmt)
-            db_pending = result.scalar_one_or_none()
+            if await self.session.scalar(stmt) is None:
+                return False
 
-            if db_pending:
-                await self.session.delete(db_pending)
-                await self.session.flush()
-                logger.info(f"Removed pending registration: telegram_id={telegram_id}")
-                return True
-            return False
+            logger.info("Removed pending registration: telegram_id=%s", telegram_id)
+            return True
+        except SQLAlchemyError as e:
+            logger.error("Failed to remove pending registration %s: %s", telegram_id, e)
+            raise
+
+    async def approve_pending(
+        self, telegram_id: int, added_by: str, notes: str = ""
+    ) -> tuple[bool, Optional[Player]]:
+        """
+        Move a pending registration into the players table.
+
+        Copies the pending row with INSERT ... SELECT (skipped if the player
+        already exists) and deletes the pending row, in the session's transaction.
+
+        Args:
+            telegram_id: Telegram user ID
+            added_by: Who approved the registration
+            notes: Additional notes
+
+        Returns:
+            Tuple of (pending_found, player)
+            - (False, None) if there was no pending registration
+            - (True, None) if the user was already registered
+            - (True, Player) if the player was added
+        """
+        try:
+            pending_found, player = await self._move_pending(
+                PendingRegistrationModel.telegram_id == telegram_id, added_by, notes
+            )
+            if player:
+                logger.info("Approved pending registration: telegram_id=%s", telegram_id)
+            return pending_found, player
+        except SQLAlchemyError as e:
+            logger.error("Failed to approve pending registration %s: %s", telegram_id, e)
+            raise
+
+    async def approve_pending_by_username(
+        self, username: str, added_by: str, notes: str = ""
+    ) -> tuple[bool, Optional[Player]]:
+        """
+        Move a pending registration found by username into the players table.
+
+        Same as approve_pending(), but the pending row is looked up by a scalar
+        subquery inside the INSERT instead of a separate SELECT. If several
+        requests share the username, the oldest one is approved.
+
+        Args:
+            username: Telegram username (with @ prefix)
+            added_by: Who approved the registration
+            notes: Additional notes
+
+        Returns:
+            Tuple of (pending_found, player), as for approve_pending()
+        """
+        try:
+            pending_telegram_id = (
+                select(PendingRegistrationModel.telegram_id)
+                .where(PendingRegistrationModel.username == username)
+                .order_by(PendingRegistrationModel.id)
+                .limit(1)
+                .scalar_subquery()
+            )
+            pending_found, player = await self._move_pending(
+                PendingRegistrationModel.telegram_id == pending_telegram_id, added_by, notes
+            )
+            if player:
+                logger.info("Approved pending registration: username=%s", username)
+            return pending_found, player
         except SQLAlchemyError as e:
-            logger.error(f"Failed to remove pending registration {telegram_id}: {e}")
+            logger.error("Failed to approve pending registration %s: %s", username, e)
             raise
 
+    async def _move_pending(
+        self, pending_match: ColumnElement[bool], added_by: str, notes: str
+    ) -> tuple[bool, Optional[Player]]:
+        """
+        Copy the matching pending row into players, unless already registered, and delete it.
+
+        The inserted player's telegram_id, returned by the INSERT, selects the row
+        to delete, so pending_match is evaluated again only if nothing was inserted.
+
+        Args:
+            pending_match: Condition selecting a single pending registration
+            added_by: Who approved the registration
+            notes: Additional notes
+
+        Returns:
+            Tuple of (pending_found, player), as for approve_pending()
+        """
+        player_exists = (
+            select(PlayerModel.id)
+            .where(PlayerModel.telegram_id == PendingRegistrationModel.telegram_id)
+            .exists()
+        )
+        source = select(
+            PendingRegistrationModel.telegram_id,
+            PendingRegistrationModel.username,
+            PendingRegistrationModel.nickname,
+            PendingRegistrationModel.screenshot_path,
+            literal("Активен"),
+            literal(added_by),
+            literal(notes),
+        ).where(pending_match, ~player_exists)
+        insert_stmt = (
+            insert(PlayerModel)
+            .from_select(
+                [
+                    PlayerModel.telegram_id,
+                    PlayerModel.username,
+                    PlayerModel.nickname,
+                    PlayerModel.screenshot_path,
+                    PlayerModel.status,
+                    PlayerModel.added_by,
+                    PlayerModel.notes,
+                ],
+                source,
+            )
+            .returning(PlayerModel)
+        )
+        db_player = (await self.session.scalars(insert_stmt)).one_or_none()
+
+        if db_player is not None:
+            pending_match = PendingRegistrationModel.telegram_id == db_player.telegram_id
+        delete_stmt = (
+            delete(PendingRegistrationModel)
+            .where(pending_match)
+            .returning(PendingRegistrationModel.id)
+        )
+        pending_found = (await self.session.scalars(delete_stmt)).one_or_none() is not None
+
+        if db_player is None:
+            return pending_found, None
+
+        return True, self._to_dataclass(db_player)
+
     async def get_all_pending(self) -> list[PendingRegistration]:
         """
         Get all pending registrations.
@@ -311,29 +612,71 @@ class PlayerRepository:
             List of PendingRegistration dataclasses
         """
         try:
-            stmt = select(PendingRegistrationModel).order_by(
-                PendingRegistrationModel.created_at.desc()
-            )
-            result = await self.session.execute(stmt)
-            db_pendings = result.scalars().all()
+            result = await self.session.execute(self._pending_rows_stmt())
+            return [self._pending_from_row(row) for row in result]
+        except SQLAlchemyError as e:
+            logger.error("Failed to get all pending registrations: %s", e)
+            raise
+
+    async def stream_all_pending(self, batch_size: int = 100) -> AsyncIterator[PendingRegistration]:
+        """
+        Stream all pending registrations without loading them into memory at once.
 
-            return [self._pending_to_dataclass(p) for p in db_pendings]
+        Rows are fetched from the server in batches of ``batch_size``.
+
+        Args:
+            batch_size: Number of rows fetched per round trip
+
+        Yields:
+            PendingRegistration dataclasses, newest first
+        """
+        try:
+            stmt = self._pending_rows_stmt().execution_options(yield_per=batch_size)
+            result = await self.session.stream(stmt)
+            async for row in result:
+                yield self._pending_from_row(row)
         except SQLAlchemyError as e:
-            logger.error(f"Failed to get all pending registrations: {e}")
+            logger.error("Failed to stream pending registrations: %s", e)
             raise
 
+    @staticmethod
+    def _player_values(player: Player) -> dict:
+        """Build INSERT parameters for a player."""
+        # registration_date is left to the column's CURRENT_TIMESTAMP server default
+        return {
+            "telegram_id": player.telegram_id,
+            "username": player.username,
+            "nickname": player.nickname,
+            "screenshot_path": player.screenshot_path,
+            "status": player.status,
+            "added_by": player.added_by,
+            "notes": player.notes,
+        }
+
+    @staticmethod
+    def _pending_values(pending: PendingRegistration) -> dict:
+        """Build INSERT parameters for a pending registration."""
+        # created_at is left to the column's server default
+        return {
+            "telegram_id": pending.telegram_id,
+            "username": pending.username,
+            "nickname": pending.nickname,
+            "screenshot_path": pending.screenshot_path,
+        }
+
     @staticmethod
     def _to_dataclass(db_player: PlayerModel) -> Player:
         """Convert SQLAlchemy model to dataclass."""
+        # isoformat() gives the same strings as strftime("%Y-%m-%d [%H:%M:%S]") but is much cheaper
         return Player(
             telegram_id=db_player.telegram_id,
             username=db_player.username,
             nickname=db_player.nickname,
             screenshot_path=db_player.screenshot_path,
-            registration_date=db_player.registration_date.strftime("%Y-%m-%d"),
+            registration_date=db_player.registration_date.date().isoformat(),
             status=db_player.status,
             added_by=db_player.added_by,
-            exclusion_date=db_player.exclusion_date.strftime("%Y-%m-%d %H:%M:%S")
+            exclusion_date=db_player.exclusion_date.isoformat(" ", "seconds")
             if db_player.exclusion_date
             else None,
             exclusion_reason=db_player.exclusion_reason,
@@ -341,6 +684,30 @@ class PlayerRepository:
             notes=db_player.notes or "",
         )
 
+    @staticmethod
+    def _pending_rows_stmt() -> Select[tuple[int, str, str, str, datetime]]:
+        """SELECT of only the columns PendingRegistration needs, newest first."""
+        # Plain rows skip ORM instance construction and the identity map
+        return select(
+            PendingRegistrationModel.telegram_id,
+            PendingRegistrationModel.username,
+            PendingRegistrationModel.nickname,
+            PendingRegistrationModel.screenshot_path,
+            PendingRegistrationModel.created_at,
+        ).order_by(PendingRegistrationModel.created_at.desc())
+
+    @staticmethod
+    def _pending_from_row(row: Row[tuple[int, str, str, str, datetime]]) -> PendingRegistration:
+        """Convert a _pending_rows_stmt() row to dataclass."""
+        telegram_id, username, nickname, screenshot_path, created_at = row
+        return PendingRegistration(
+            telegram_id=telegram_id,
+            username=username,
+            nickname=nickname,
+            screenshot_path=screenshot_path,
+            timestamp=created_at.isoformat(" ", "seconds"),
+        )
+
     @staticmethod
     def _pending_to_dataclass(db_pending: PendingRegistrationModel) -> PendingRegistration:
         """Convert SQLAlchemy model to dataclass."""
@@ -349,5 +716,5 @@ class PlayerRepository:
             username=db_pending.username,
             nickname=db_pending.nickname,
             screenshot_path=db_pending.screenshot_path,
-            timestamp=db_pending.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+            timestamp=db_pending.created_at.isoformat(" ", "seconds"),
         )
@@ -7,8 +7,10 @@ import sys
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
+from aiogram.fsm.storage.base import BaseStorage
+from aiogram.fsm.storage.memory import MemoryStorage
 
-from config.settings import load_settings
+from config.settings import Settings, load_settings
 from database.database import create_database
 
 # Setup logging
@@ -23,6 +25,48 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def create_fsm_storage(settings: Settings) -> BaseStorage:
+    """
+    Create FSM storage for registration state.
+
+    Uses Redis when REDIS_URL is configured, so registration state survives
+    restarts and can be shared between bot instances. Falls back to memory.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        FSM storage instance
+    """
+    if not settings.storage.redis_url:
+        return MemoryStorage()
+
+    # Requires the optional "redis" dependency
+    from aiogram.fsm.storage.redis import DefaultKeyBuilder, RedisStorage
+
+    return RedisStorage.from_url(
+        settings.storage.redis_url, key_builder=DefaultKeyBuilder(with_bot_id=True)
+    )
+
+
+def install_uvloop() -> bool:
+    """
+    Switch asyncio to uvloop if it is installed.
+
+    Requires the optional "uvloop" dependency (not available on Windows).
+
+    Returns:
+        True if uvloop's event loop policy was installed
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
 async def main() -> None:
     """Main function to run the bot."""
     # Load settings
@@ -34,14 +78,19 @@ async def main() -> None:
     db = create_database(
         settings.database.database_url,
         echo=settings.logging.log_level == "DEBUG",
+        pool_size=settings.database.pool_size,
+        max_overflow=settings.database.max_overflow,
+        pool_timeout=settings.database.pool_timeout,
+        pool_recycle=settings.database.pool_recycle,
     )
 
     # Run migrations if needed
     try:
         await db.create_tables()
         logger.info("Database tables created/verified")
+        await db.warm_up()
     except Exception as e:
-        logger.error(f"Failed to create database tables: {e}")
+        logger.error(f"Failed to prepare database: {e}")
         await db.close()
         sys.exit(1)
 
@@ -50,7 +99,8 @@ async def main() -> None:
     bot = Bot(
         token=settings.telegram.bot_token, default=DefaultBotProperties(parse_mode=ParseMode.HTML)
     )
-    dp = Dispatcher()
+    dp = Dispatcher(storage=create_fsm_storage(settings))
+    logger.info(f"FSM storage: {type(dp.storage).__name__}")
 
     # Store database instance in bot data for access in handlers
     dp["db"] = db
@@ -59,7 +109,13 @@ async def main() -> None:
     # Register middleware
     from bot.middleware.rate_limit import RateLimitMiddleware
 
-    dp.message.middleware(RateLimitMiddleware(rate_limit=5, time_window=60))
+    dp.message.middleware(
+        RateLimitMiddleware(
+            rate_limit=5,
+            time_window=60,
+            exempt_user_ids=frozenset({settings.telegram.leader_telegram_id}),
+        )
+    )
     logger.info("Rate limiting middleware registered (5 requests per 60 seconds)")
 
     # Register routers/handlers
@@ -77,11 +133,14 @@ async def main() -> None:
     finally:
         logger.info("Shutting down...")
         await bot.session.close()
+        await dp.storage.close()
         await db.close()
         logger.info("Bot stopped")
 
 
 if __name__ == "__main__":
+    if install_uvloop():
+        logger.info("Using uvloop event loop")
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
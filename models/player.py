@@ -1,9 +1,10 @@
+import time
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import date
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     """Player data model for clan member."""
 
@@ -11,7 +12,7 @@ class Player:
     username: str
     nickname: str
     screenshot_path: Optional[str] = None
-    registration_date: str = field(default_factory=lambda: datetime.now().strftime("%Y-%m-%d"))
+    registration_date: str = field(default_factory=lambda: date.today().isoformat())
     status: str = "Активен"
     added_by: str = "bot"
     exclusion_date: Optional[str] = None
@@ -74,7 +75,7 @@ class Player:
             username=data.get("username", ""),
             nickname=data.get("nickname", ""),
             screenshot_path=data.get("screenshot_path"),
-            registration_date=data.get("registration_date", datetime.now().strftime("%Y-%m-%d")),
+            registration_date=data.get("registration_date", date.today().isoformat()),
             status=data.get("status", "Активен"),
             added_by=data.get("added_by", "bot"),
             exclusion_date=data.get("exclusion_date"),
@@ -99,7 +100,7 @@ class Player:
             telegram_id=int(row[0]) if row[0] else 0,
             username=row[1] if len(row) > 1 else "",
             nickname=row[2] if len(row) > 2 else "",
-            registration_date=row[3] if len(row) > 3 else datetime.now().strftime("%Y-%m-%d"),
+            registration_date=row[3] if len(row) > 3 else date.today().isoformat(),
             status=row[4] if len(row) > 4 else "Активен",
             added_by=row[5] if len(row) > 5 else "bot",
             notes=row[6] if len(row) > 6 else "",
@@ -118,7 +119,7 @@ class Player:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PendingRegistration:
     """Temporary model for pending player registrations."""
 
@@ -126,7 +127,7 @@ class PendingRegistration:
     username: str
     nickname: str
     screenshot_path: str
-    timestamp: str = field(default_factory=lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    timestamp: str = field(default_factory=lambda: time.strftime("%Y-%m-%d %H:%M:%S"))
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON storage."""
@@ -146,7 +147,7 @@ class PendingRegistration:
             username=data.get("username", ""),
             nickname=data.get("nickname", ""),
             screenshot_path=data.get("screenshot_path", ""),
-            timestamp=data.get("timestamp", datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            timestamp=data.get("timestamp", time.strftime("%Y-%m-%d %H:%M:%S")),
         )
 
     def to_player(self, added_by: str = "bot", notes: str = "via /accept") -> Player:
@@ -165,7 +166,6 @@ class PendingRegistration:
             username=self.username,
             nickname=self.nickname,
             screenshot_path=self.screenshot_path,
-            registration_date=datetime.now().strftime("%Y-%m-%d"),
             status="Активен",
             added_by=added_by,
             notes=notes,
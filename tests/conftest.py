@@ -1,15 +1,21 @@
 """Shared fixtures for all tests."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from aiogram import Bot
+from aiogram import Bot, Dispatcher
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.storage.base import StorageKey
 from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.types import CallbackQuery, Chat, Message, Update, User
+from pytest_asyncio import is_async_test
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from bot.handlers import admin, common, registration
 from config.settings import (
     DatabaseConfig,
     LoggingConfig,
@@ -19,6 +25,11 @@ from config.settings import (
 )
 from database.database import Database
 
+# Handlers never read Message.date, so every test message shares one timestamp
+FROZEN_NOW = datetime.now()
+
+_LEADER_TELEGRAM_ID = 999999999
+
 
 @pytest.fixture
 def test_settings(tmp_path):
@@ -29,7 +40,7 @@ def test_settings(tmp_path):
     return Settings(
         telegram=TelegramConfig(
             bot_token="123456:TEST_TOKEN",
-            leader_telegram_id=999999999,
+            leader_telegram_id=_LEADER_TELEGRAM_ID,
         ),
         database=DatabaseConfig(
             database_url="sqlite+aiosqlite:///:memory:",
@@ -45,22 +56,78 @@ def test_settings(tmp_path):
     )
 
 
-@pytest.fixture
-async def database(test_settings):
-    """Create test database."""
-    db = Database(test_settings.database.database_url, echo=False)
+def pytest_collection_modifyitems(items):
+    """Run every async test in the session event loop shared with async fixtures."""
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
+@pytest.fixture(scope="session")
+async def session_database(tmp_path_factory):
+    """SQLite file database with all tables, created once per test run (per xdist worker)."""
+    path = tmp_path_factory.mktemp("db") / "test.db"
+    db = Database(f"sqlite+aiosqlite:///{path}", echo=False, sqlite_wal=True)
     db.init()
+
+    # pysqlite only begins transactions before DML, which breaks SAVEPOINTs;
+    # take over transaction control so BEGIN/SAVEPOINT are emitted as requested
+    @event.listens_for(db.engine.sync_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(db.engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     await db.create_tables()
     yield db
     await db.close()
 
 
+@pytest.fixture
+async def database(session_database):
+    """
+    Create test database whose sessions run inside a per-test transaction.
+
+    See rollback_database().
+    """
+    async with rollback_database(session_database) as db:
+        yield db
+
+
 @pytest.fixture
 def storage():
     """Create FSM storage."""
     return MemoryStorage()
 
 
+@pytest.fixture(scope="session")
+def session_storage():
+    """Create FSM storage shared by the session dispatcher."""
+    return MemoryStorage()
+
+
+@pytest.fixture(scope="session")
+def session_dispatcher(session_storage):
+    """Create single dispatcher with all routers for the whole test session."""
+    dp = Dispatcher(storage=session_storage)
+
+    # Routers can only be attached once, and including them is not free
+    dp.include_router(common.router)
+    dp.include_router(registration.router)
+    dp.include_router(admin.router)
+
+    return dp
+
+
+@pytest.fixture(autouse=True)
+def clear_session_storage(session_storage):
+    """Reset FSM states and data left in the shared storage by previous tests."""
+    session_storage.storage.clear()
+
+
 @pytest.fixture
 def user():
     """Create test user."""
@@ -73,11 +140,11 @@ def user():
     )
 
 
-@pytest.fixture
-def admin_user(test_settings):
-    """Create admin user."""
+@pytest.fixture(scope="session")
+def admin_user():
+    """Create admin user (the leader from test_settings)."""
     return User(
-        id=test_settings.telegram.leader_telegram_id,
+        id=_LEADER_TELEGRAM_ID,
         is_bot=False,
         first_name="Admin",
         username="admin",
@@ -90,10 +157,26 @@ def chat():
     return Chat(id=123456789, type="private")
 
 
-@pytest.fixture
-def admin_chat(test_settings):
+@pytest.fixture(scope="session")
+def admin_chat():
     """Create admin chat."""
-    return Chat(id=test_settings.telegram.leader_telegram_id, type="private")
+    return Chat(id=_LEADER_TELEGRAM_ID, type="private")
+
+
+@pytest.fixture(scope="module")
+def template_admin_message(admin_user, admin_chat):
+    """
+    Create admin chat message with an application card, validated once per module.
+
+    Message is frozen; use model_copy(update={...}) for per-test changes.
+    """
+    return Message(
+        message_id=1,
+        date=FROZEN_NOW,
+        chat=admin_chat,
+        from_user=admin_user,
+        caption="Test pending application",
+    )
 
 
 @pytest.fixture
@@ -120,6 +203,35 @@ async def fsm_context(storage, user, chat):
 # Helper functions for creating test objects
 
 
+@asynccontextmanager
+async def rollback_database(session_database: Database) -> AsyncIterator[Database]:
+    """Helper to wrap the shared database in a transaction rolled back on exit.
+
+    Shares the session engine; the caller works in an outer transaction that
+    is rolled back at exit. Sessions join it through SAVEPOINTs, so commits
+    and rollbacks inside handlers behave as usual.
+
+    Args:
+        session_database: Initialized database shared by the test session
+
+    Yields:
+        Database whose sessions are bound to the outer transaction
+    """
+    async with session_database.engine.connect() as connection:
+        await connection.begin()
+        db = Database(session_database.database_url, echo=False)
+        db._engine = session_database.engine
+        db._session_factory = async_sessionmaker(
+            bind=connection,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autoflush=False,
+            join_transaction_mode="create_savepoint",
+        )
+        yield db
+        await connection.rollback()
+
+
 def create_message(text: str, user: User, chat: Chat, **kwargs) -> Message:
     """Helper to create message object.
 
@@ -134,7 +246,7 @@ def create_message(text: str, user: User, chat: Chat, **kwargs) -> Message:
     """
     return Message(
         message_id=1,
-        date=datetime.now(),
+        date=FROZEN_NOW,
         chat=chat,
         from_user=user,
         text=text,
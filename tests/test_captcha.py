@@ -11,7 +11,7 @@ from utils.captcha import (
     get_captcha_keyboard_data,
     get_questions,
     load_questions,
-    validate_captcha_answer,
+    normalize_answer,
 )
 
 
@@ -28,18 +28,6 @@ class TestCaptchaQuestion:
         assert "B" in options
         assert "C" in options
 
-    def test_is_correct(self):
-        """Test answer validation."""
-        question = CaptchaQuestion(
-            question="Test?", correct_answer="correct", wrong_answers=["wrong1", "wrong2"]
-        )
-
-        assert question.is_correct("correct")
-        assert question.is_correct("CORRECT")  # Case insensitive
-        assert question.is_correct("  correct  ")  # Strips whitespace
-        assert not question.is_correct("wrong1")
-        assert not question.is_correct("wrong2")
-
 
 class TestLoadQuestions:
     """Test question loading from JSON."""
@@ -106,28 +94,21 @@ class TestGetCaptchaKeyboardData:
             assert callback_data.split(":")[1] in ["A", "B", "C"]
 
 
-class TestValidateCaptchaAnswer:
-    """Test answer validation."""
-
-    def test_validate_correct_answer(self):
-        """Test validation of correct answer."""
-        question = CaptchaQuestion(
-            question="Test?", correct_answer="correct", wrong_answers=["wrong1", "wrong2"]
-        )
-
-        assert validate_captcha_answer(question, "correct")
-        assert validate_captcha_answer(question, "CORRECT")
-        assert validate_captcha_answer(question, "  correct  ")
+class TestNormalizeAnswer:
+    """Test answer normalization."""
 
-    def test_validate_wrong_answer(self):
-        """Test validation of wrong answer."""
-        question = CaptchaQuestion(
-            question="Test?", correct_answer="correct", wrong_answers=["wrong1", "wrong2"]
-        )
+    def test_normalized_answers_match(self):
+        """Test that case and surrounding whitespace are ignored."""
+        assert normalize_answer("correct") == normalize_answer("correct")
+        assert normalize_answer("CORRECT") == normalize_answer("correct")
+        assert normalize_answer("  correct  ") == normalize_answer("correct")
+        # casefold() also folds characters that lower() leaves alone
+        assert normalize_answer("STRASSE") == normalize_answer("straße")
 
-        assert not validate_captcha_answer(question, "wrong1")
-        assert not validate_captcha_answer(question, "wrong2")
-        assert not validate_captcha_answer(question, "random")
+    def test_different_answers_do_not_match(self):
+        """Test that other answers stay different after normalization."""
+        assert normalize_answer("wrong1") != normalize_answer("correct")
+        assert normalize_answer("random") != normalize_answer("correct")
 
 
 class TestGetCaptchaExplanation:
@@ -137,19 +118,20 @@ class TestGetCaptchaExplanation:
         """Test that explanation contains important information."""
         explanation = get_captcha_explanation()
 
-        assert "безопасност" in explanation.lower()
-        assert "бот" in explanation.lower()
-        assert "спам" in explanation.lower()
+        explanation_lower = explanation.lower()
+        assert "безопасност" in explanation_lower
+        assert "бот" in explanation_lower
+        assert "спам" in explanation_lower
 
 
 class TestGetQuestions:
     """Test get_questions caching."""
 
-    def test_get_questions_returns_list(self):
-        """Test that get_questions returns a list of questions."""
+    def test_get_questions_returns_tuple(self):
+        """Test that get_questions returns an immutable tuple of questions."""
         questions = get_questions()
 
-        assert isinstance(questions, list)
+        assert isinstance(questions, tuple)
         assert len(questions) > 0
         assert all(isinstance(q, CaptchaQuestion) for q in questions)
 
@@ -158,5 +140,5 @@ class TestGetQuestions:
         questions1 = get_questions()
         questions2 = get_questions()
 
-        # Should return the same list object (cached)
+        # Should return the same tuple object (cached)
         assert questions1 is questions2
@@ -1,10 +1,12 @@
 """Integration tests for admin handlers."""
 
+from dataclasses import dataclass
 from datetime import datetime
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from aiogram.types import CallbackQuery, Chat, Message, User
+from sqlalchemy import insert
 
 from bot.handlers.admin import (
     cmd_approve,
@@ -14,8 +16,10 @@ from bot.handlers.admin import (
     process_approve,
     process_reject,
 )
+from bot.keyboards.admin import ApproveCallback, RejectCallback
 from config.settings import Settings
 from database.database import Database
+from database.models import PendingRegistration as PendingRegistrationModel
 from database.repository import PlayerRepository
 from models.player import PendingRegistration, Player
 
@@ -23,17 +27,59 @@ from models.player import PendingRegistration, Player
 from tests.conftest import create_callback, create_message
 
 
+@dataclass
+class AiogramMocks:
+    """Mocks installed over aiogram methods that would call the Telegram API."""
+
+    message_answer: AsyncMock
+    edit_caption: AsyncMock
+    callback_answer: AsyncMock
+
+
+@pytest.fixture(autouse=True)
+def aiogram_mocks(monkeypatch) -> AiogramMocks:
+    """Replace Message.answer, Message.edit_caption and CallbackQuery.answer for each test."""
+    mocks = AiogramMocks(
+        message_answer=AsyncMock(), edit_caption=AsyncMock(), callback_answer=AsyncMock()
+    )
+    monkeypatch.setattr(Message, "answer", mocks.message_answer)
+    monkeypatch.setattr(Message, "edit_caption", mocks.edit_caption)
+    monkeypatch.setattr(CallbackQuery, "answer", mocks.callback_answer)
+    return mocks
+
+
+@pytest.fixture(scope="module")
+def module_bot_mock() -> MagicMock:
+    """Bot mock for user notifications, built once for the whole module."""
+    bot = MagicMock()
+    bot.send_message = AsyncMock()
+    return bot
+
+
+@pytest.fixture
+def bot_mock(module_bot_mock: MagicMock) -> MagicMock:
+    """Bot mock with calls from previous tests cleared."""
+    module_bot_mock.reset_mock()
+    return module_bot_mock
+
+
 class TestApproveCallback:
     """Test approve callback handler."""
 
     @pytest.mark.asyncio
     async def test_approve_by_admin(
-        self, database: Database, test_settings: Settings, admin_user: User, admin_chat: Chat
+        self,
+        database: Database,
+        test_settings: Settings,
+        admin_user: User,
+        template_admin_message: Message,
+        aiogram_mocks: AiogramMocks,
+        bot_mock: MagicMock,
     ):
         """Test approving registration by admin."""
         # Add pending registration
         pending_user_id = 123456789
-        async for session in database.get_session():
+        async with database.session() as session:
             repo = PlayerRepository(session)
             pending = PendingRegistration(
                 telegram_id=pending_user_id,
@@ -43,41 +89,31 @@ class TestApproveCallback:
             )
             await repo.save_pending(pending)
 
-        # Create callback
-        message = Message(
-            message_id=1,
-            date=datetime.now(),
-            chat=admin_chat,
-            from_user=admin_user,
-            caption="Test pending application",
-        )
-        callback = create_callback(f"approve:{pending_user_id}", admin_user, message)
+        callback = create_callback(f"approve:{pending_user_id}", admin_user, template_admin_message)
 
-        # Mock bot and message methods
-        mock_bot = MagicMock()
-        mock_bot.send_message = AsyncMock()
-        # Use object.__setattr__ to bypass frozen model
-        object.__setattr__(callback, "_bot", mock_bot)
+        # Bind the module's bot mock so notifications can be checked
+        callback.as_(bot_mock)
 
-        with (
-            patch.object(CallbackQuery, "answer", new=AsyncMock()) as mock_answer,
-            patch.object(Message, "edit_caption", new=AsyncMock()) as mock_edit,
-        ):
-            await process_approve(callback, database, test_settings)
+        await process_approve(
+            callback,
+            ApproveCallback(telegram_id=pending_user_id),
+            database,
+            settings=test_settings,
+        )
 
-            # Check that approval was processed
-            mock_answer.assert_called_once()
-            assert "одобрена" in mock_answer.call_args[0][0].lower()
+        # Check that approval was processed
+        aiogram_mocks.callback_answer.assert_called_once()
+        assert "одобрена" in aiogram_mocks.callback_answer.call_args[0][0].lower()
 
-            # Check that message was edited
-            mock_edit.assert_called_once()
+        # Check that message was edited
+        aiogram_mocks.edit_caption.assert_called_once()
 
-            # Check that user was notified
-            mock_bot.send_message.assert_called_once()
-            assert mock_bot.send_message.call_args[1]["chat_id"] == pending_user_id
+        # Check that user was notified
+        bot_mock.send_message.assert_called_once()
+        assert bot_mock.send_message.call_args[1]["chat_id"] == pending_user_id
 
         # Check that player was added to database
-        async for session in database.get_session():
+        async with database.session() as session:
             repo = PlayerRepository(session)
             player = await repo.get_player(pending_user_id)
             assert player is not None
@@ -90,18 +126,23 @@ class TestApproveCallback:
 
     @pytest.mark.asyncio
     async def test_approve_by_non_admin(
-        self, database: Database, test_settings: Settings, user: User, chat: Chat
+        self,
+        database: Database,
+        test_settings: Settings,
+        user: User,
+        chat: Chat,
+        aiogram_mocks: AiogramMocks,
     ):
         """Test that non-admin cannot approve."""
         message = create_message("", user, chat)
-        callback = create_callback("approve:123456789", user, message)
+        callback_data = ApproveCallback(telegram_id=123456789)
+        callback = create_callback(callback_data.pack(), user, message)
 
-        with patch.object(CallbackQuery, "answer", new=AsyncMock()) as mock_answer:
-            await process_approve(callback, database, test_settings)
+        await process_approve(callback, callback_data, database, settings=test_settings)
 
-            # Check that rejection was sent
-            mock_answer.assert_called_once()
-            assert "нет прав" in mock_answer.call_args[0][0].lower()
+        # Check that rejection was sent
+        aiogram_mocks.callback_answer.assert_called_once()
+        assert "нет прав" in aiogram_mocks.callback_answer.call_args[0][0].lower()
 
 
 class TestRejectCallback:
@@ -109,12 +150,18 @@ class TestRejectCallback:
 
     @pytest.mark.asyncio
     async def test_reject_by_admin(
-        self, database: Database, test_settings: Settings, admin_user: User, admin_chat: Chat
+        self,
+        database: Database,
+        test_settings: Settings,
+        admin_user: User,
+        template_admin_message: Message,
+        aiogram_mocks: AiogramMocks,
+        bot_mock: MagicMock,
     ):
         """Test rejecting registration by admin."""
         # Add pending registration
         pending_user_id = 123456789
-        async for session in database.get_session():
+        async with database.session() as session:
             repo = PlayerRepository(session)
             pending = PendingRegistration(
                 telegram_id=pending_user_id,
@@ -124,37 +171,27 @@ class TestRejectCallback:
             )
             await repo.save_pending(pending)
 
-        # Create callback
-        message = Message(
-            message_id=1,
-            date=datetime.now(),
-            chat=admin_chat,
-            from_user=admin_user,
-            caption="Test pending application",
-        )
-        callback = create_callback(f"reject:{pending_user_id}", admin_user, message)
+        callback = create_callback(f"reject:{pending_user_id}", admin_user, template_admin_message)
 
-        # Mock bot and message methods
-        mock_bot = MagicMock()
-        mock_bot.send_message = AsyncMock()
-        # Use object.__setattr__ to bypass frozen model
-        object.__setattr__(callback, "_bot", mock_bot)
+        # Bind the module's bot mock so notifications can be checked
+        callback.as_(bot_mock)
 
-        with (
-            patch.object(CallbackQuery, "answer", new=AsyncMock()) as mock_answer,
-            patch.object(Message, "edit_caption", new=AsyncMock()) as mock_edit,
-        ):
-            await process_reject(callback, database, test_settings)
+        await process_reject(
+            callback,
+            RejectCallback(telegram_id=pending_user_id),
+            database,
+            settings=test_settings,
+        )
 
-            # Check that rejection was processed
-            mock_answer.assert_called_once()
-            assert "отклонена" in mock_answer.call_args[0][0].lower()
+        # Check that rejection was processed
+        aiogram_mocks.callback_answer.assert_called_once()
+        assert "отклонена" in aiogram_mocks.callback_answer.call_args[0][0].lower()
 
-            # Check that message was edited
-            mock_edit.assert_called_once()
+        # Check that message was edited
+        aiogram_mocks.edit_caption.assert_called_once()
 
         # Check that pending was removed
-        async for session in database.get_session():
+        async with database.session() as session:
             repo = PlayerRepository(session)
             pending = await repo.get_pending(pending_user_id)
             assert pending is None
@@ -165,48 +202,59 @@ class TestPendingCommand:
 
     @pytest.mark.asyncio
     async def test_pending_with_applications(
-        self, database: Database, test_settings: Settings, admin_user: User, admin_chat: Chat
+        self,
+        database: Database,
+        test_settings: Settings,
+        admin_user: User,
+        admin_chat: Chat,
+        aiogram_mocks: AiogramMocks,
     ):
         """Test showing pending applications."""
         # Add pending registrations
-        async for session in database.get_session():
-            repo = PlayerRepository(session)
-            for i in range(3):
-                pending = PendingRegistration(
-                    telegram_id=123456789 + i,
-                    username=f"@user{i}",
-                    nickname=f"Player{i}",
-                    screenshot_path=f"/path/to/screenshot{i}.jpg",
-                )
-                await repo.save_pending(pending)
+        async with database.session() as session:
+            await session.execute(
+                insert(PendingRegistrationModel),
+                [
+                    {
+                        "telegram_id": 123456789 + i,
+                        "username": f"@user{i}",
+                        "nickname": f"Player{i}",
+                        "screenshot_path": f"/path/to/screenshot{i}.jpg",
+                    }
+                    for i in range(3)
+                ],
+            )
 
         message = create_message("/pending", admin_user, admin_chat)
 
-        with patch.object(Message, "answer", new=AsyncMock()) as mock_answer:
-            await cmd_pending(message, database, test_settings)
+        await cmd_pending(message, database, settings=test_settings)
 
-            # Check that response was sent
-            mock_answer.assert_called_once()
-            response_text = mock_answer.call_args[0][0]
-            assert "ожидающие заявки" in response_text.lower()
-            assert "Player0" in response_text
-            assert "Player1" in response_text
-            assert "Player2" in response_text
+        # Check that response was sent
+        aiogram_mocks.message_answer.assert_called_once()
+        response_text = aiogram_mocks.message_answer.call_args[0][0]
+        assert "ожидающие заявки" in response_text.lower()
+        assert "Player0" in response_text
+        assert "Player1" in response_text
+        assert "Player2" in response_text
 
     @pytest.mark.asyncio
     async def test_pending_empty(
-        self, database: Database, test_settings: Settings, admin_user: User, admin_chat: Chat
+        self,
+        database: Database,
+        test_settings: Settings,
+        admin_user: User,
+        admin_chat: Chat,
+        aiogram_mocks: AiogramMocks,
     ):
         """Test showing pending when there are no applications."""
         message = create_message("/pending", admin_user, admin_chat)
 
-        with patch.object(Message, "answer", new=AsyncMock()) as mock_answer:
-            await cmd_pending(message, database, test_settings)
+        await cmd_pending(message, database, settings=test_settings)
 
-            # Check that empty message was sent
-            mock_answer.assert_called_once()
-            response_text = mock_answer.call_args[0][0]
-            assert "нет ожидающих" in response_text.lower()
+        # Check that empty message was sent
+        aiogram_mocks.message_answer.assert_called_once()
+        response_text = aiogram_mocks.message_answer.call_args[0][0]
+        assert "нет ожидающих" in response_text.lower()
 
 
 class TestListCommand:
@@ -214,47 +262,54 @@ class TestListCommand:
 
     @pytest.mark.asyncio
     async def test_list_with_players(
-        self, database: Database, test_settings: Settings, admin_user: User, admin_chat: Chat
+        self,
+        database: Database,
+        test_settings: Settings,
+        admin_user: User,
+        admin_chat: Chat,
+        aiogram_mocks: AiogramMocks,
     ):
         """Test showing list of players."""
         # Add players
-        async for session in database.get_session():
-            repo = PlayerRepository(session)
-            for i in range(3):
-                player = Player(
-                    telegram_id=123456789 + i,
-                    username=f"@player{i}",
-                    nickname=f"Player{i}",
-                    screenshot_path=f"/path{i}.jpg",
-                    registration_date=datetime.now().strftime("%Y-%m-%d"),
-                    status="Активен",
-                )
-                await repo.add_player(player)
-
-            # Add excluded player
-            excluded_player = Player(
+        registration_date = datetime.now().strftime("%Y-%m-%d")
+        players = [
+            Player(
+                telegram_id=123456789 + i,
+                username=f"@player{i}",
+                nickname=f"Player{i}",
+                screenshot_path=f"/path{i}.jpg",
+                registration_date=registration_date,
+                status="Активен",
+            )
+            for i in range(3)
+        ]
+        # Add excluded player
+        players.append(
+            Player(
                 telegram_id=999999999,
                 username="@excluded",
                 nickname="ExcludedPlayer",
                 screenshot_path="/path_excluded.jpg",
-                registration_date=datetime.now().strftime("%Y-%m-%d"),
+                registration_date=registration_date,
                 status="Отчислен",
             )
-            await repo.add_player(excluded_player)
+        )
+        async with database.session() as session:
+            await PlayerRepository(session).add_players(players)
 
         message = create_message("/list", admin_user, admin_chat)
 
-        with patch.object(Message, "answer", new=AsyncMock()) as mock_answer:
-            await cmd_list(message, database, test_settings)
+        await cmd_list(message, database, settings=test_settings)
 
-            # Check that response was sent
-            mock_answer.assert_called_once()
-            response_text = mock_answer.call_args[0][0]
-            assert "всего игроков: 4" in response_text.lower()
-            assert "активные (3)" in response_text.lower()
-            assert "Player0" in response_text
-            assert "отчисленные (1)" in response_text.lower()
-            assert "ExcludedPlayer" in response_text
+        # Check that response was sent
+        aiogram_mocks.message_answer.assert_called_once()
+        response_text = aiogram_mocks.message_answer.call_args[0][0]
+        response_text_lower = response_text.lower()
+        assert "всего игроков: 4" in response_text_lower
+        assert "активные (3)" in response_text_lower
+        assert "Player0" in response_text
+        assert "отчисленные (1)" in response_text_lower
+        assert "ExcludedPlayer" in response_text
 
 
 class TestApproveCommand:
@@ -262,12 +317,18 @@ class TestApproveCommand:
 
     @pytest.mark.asyncio
     async def test_approve_by_username(
-        self, database: Database, test_settings: Settings, admin_user: User, admin_chat: Chat
+        self,
+        database: Database,
+        test_settings: Settings,
+        admin_user: User,
+        admin_chat: Chat,
+        aiogram_mocks: AiogramMocks,
+        bot_mock: MagicMock,
     ):
         """Test approving registration by username."""
         # Add pending registration
         pending_user_id = 123456789
-        async for session in database.get_session():
+        async with database.session() as session:
             repo = PlayerRepository(session)
             pending = PendingRegistration(
                 telegram_id=pending_user_id,
@@ -279,27 +340,23 @@ class TestApproveCommand:
 
         message = create_message("/approve @testuser", admin_user, admin_chat)
 
-        # Mock bot methods
-        mock_bot = MagicMock()
-        mock_bot.send_message = AsyncMock()
-        # Use object.__setattr__ to bypass frozen model
-        object.__setattr__(message, "_bot", mock_bot)
+        # Bind the module's bot mock so notifications can be checked
+        message.as_(bot_mock)
 
-        with patch.object(Message, "answer", new=AsyncMock()) as mock_answer:
-            await cmd_approve(message, database, test_settings)
+        await cmd_approve(message, database, settings=test_settings)
 
-            # Check that success message was sent
-            mock_answer.assert_called_once()
-            response_text = mock_answer.call_args[0][0]
-            assert "одобрена" in response_text.lower()
-            assert "TestPlayer" in response_text
+        # Check that success message was sent
+        aiogram_mocks.message_answer.assert_called_once()
+        response_text = aiogram_mocks.message_answer.call_args[0][0]
+        assert "одобрена" in response_text.lower()
+        assert "TestPlayer" in response_text
 
-            # Check that user was notified
-            mock_bot.send_message.assert_called_once()
-            assert mock_bot.send_message.call_args[1]["chat_id"] == pending_user_id
+        # Check that user was notified
+        bot_mock.send_message.assert_called_once()
+        assert bot_mock.send_message.call_args[1]["chat_id"] == pending_user_id
 
         # Check that player was added to database
-        async for session in database.get_session():
+        async with database.session() as session:
             repo = PlayerRepository(session)
             player = await repo.get_player(pending_user_id)
             assert player is not None
@@ -312,42 +369,55 @@ class TestApproveCommand:
 
     @pytest.mark.asyncio
     async def test_approve_invalid_format(
-        self, database: Database, test_settings: Settings, admin_user: User, admin_chat: Chat
+        self,
+        database: Database,
+        test_settings: Settings,
+        admin_user: User,
+        admin_chat: Chat,
+        aiogram_mocks: AiogramMocks,
     ):
         """Test approve with invalid command format."""
         message = create_message("/approve", admin_user, admin_chat)
 
-        with patch.object(Message, "answer", new=AsyncMock()) as mock_answer:
-            await cmd_approve(message, database, test_settings)
+        await cmd_approve(message, database, settings=test_settings)
 
-            # Check that error message was sent
-            mock_answer.assert_called_once()
-            response_text = mock_answer.call_args[0][0]
-            assert "неверный формат" in response_text.lower()
+        # Check that error message was sent
+        aiogram_mocks.message_answer.assert_called_once()
+        response_text = aiogram_mocks.message_answer.call_args[0][0]
+        assert "неверный формат" in response_text.lower()
 
     @pytest.mark.asyncio
     async def test_approve_non_existing_pending(
-        self, database: Database, test_settings: Settings, admin_user: User, admin_chat: Chat
+        self,
+        database: Database,
+        test_settings: Settings,
+        admin_user: User,
+        admin_chat: Chat,
+        aiogram_mocks: AiogramMocks,
     ):
         """Test approving pending that doesn't exist."""
         message = create_message("/approve @nonexistent", admin_user, admin_chat)
 
-        with patch.object(Message, "answer", new=AsyncMock()) as mock_answer:
-            await cmd_approve(message, database, test_settings)
+        await cmd_approve(message, database, settings=test_settings)
 
-            # Check that error message was sent
-            mock_answer.assert_called_once()
-            response_text = mock_answer.call_args[0][0]
-            assert "не найдена" in response_text.lower()
+        # Check that error message was sent
+        aiogram_mocks.message_answer.assert_called_once()
+        response_text = aiogram_mocks.message_answer.call_args[0][0]
+        assert "не найдена" in response_text.lower()
 
     @pytest.mark.asyncio
     async def test_approve_already_registered(
-        self, database: Database, test_settings: Settings, admin_user: User, admin_chat: Chat
+        self,
+        database: Database,
+        test_settings: Settings,
+        admin_user: User,
+        admin_chat: Chat,
+        aiogram_mocks: AiogramMocks,
     ):
         """Test approving user that is already registered."""
         # Add both pending and player with same telegram_id
         user_id = 123456789
-        async for session in database.get_session():
+        async with database.session() as session:
             repo = PlayerRepository(session)
 
             # Add as player first
@@ -372,13 +442,12 @@ class TestApproveCommand:
 
         message = create_message("/approve @testuser", admin_user, admin_chat)
 
-        with patch.object(Message, "answer", new=AsyncMock()) as mock_answer:
-            await cmd_approve(message, database, test_settings)
+        await cmd_approve(message, database, settings=test_settings)
 
-            # Check that error message was sent
-            mock_answer.assert_called_once()
-            response_text = mock_answer.call_args[0][0]
-            assert "уже зарегистрирован" in response_text.lower()
+        # Check that error message was sent
+        aiogram_mocks.message_answer.assert_called_once()
+        response_text = aiogram_mocks.message_answer.call_args[0][0]
+        assert "уже зарегистрирован" in response_text.lower()
 
 
 class TestExcludeCommand:
@@ -386,12 +455,18 @@ class TestExcludeCommand:
 
     @pytest.mark.asyncio
     async def test_exclude_player(
-        self, database: Database, test_settings: Settings, admin_user: User, admin_chat: Chat
+        self,
+        database: Database,
+        test_settings: Settings,
+        admin_user: User,
+        admin_chat: Chat,
+        aiogram_mocks: AiogramMocks,
+        bot_mock: MagicMock,
     ):
         """Test excluding a player."""
         # Add player
         player_id = 123456789
-        async for session in database.get_session():
+        async with database.session() as session:
             repo = PlayerRepository(session)
             player = Player(
                 telegram_id=player_id,
@@ -405,22 +480,18 @@ class TestExcludeCommand:
 
         message = create_message("/exclude @testplayer Нарушение правил", admin_user, admin_chat)
 
-        # Mock bot methods
-        mock_bot = MagicMock()
-        mock_bot.send_message = AsyncMock()
-        # Use object.__setattr__ to bypass frozen model
-        object.__setattr__(message, "_bot", mock_bot)
+        # Bind the module's bot mock so notifications can be checked
+        message.as_(bot_mock)
 
-        with patch.object(Message, "answer", new=AsyncMock()) as mock_answer:
-            await cmd_exclude(message, database, test_settings)
+        await cmd_exclude(message, database, settings=test_settings)
 
-            # Check that success message was sent
-            mock_answer.assert_called_once()
-            response_text = mock_answer.call_args[0][0]
-            assert "отчислен" in response_text.lower()
+        # Check that success message was sent
+        aiogram_mocks.message_answer.assert_called_once()
+        response_text = aiogram_mocks.message_answer.call_args[0][0]
+        assert "отчислен" in response_text.lower()
 
         # Check that player was excluded in database
-        async for session in database.get_session():
+        async with database.session() as session:
             repo = PlayerRepository(session)
             player = await repo.get_player(player_id)
             assert player is not None
@@ -429,30 +500,38 @@ class TestExcludeCommand:
 
     @pytest.mark.asyncio
     async def test_exclude_invalid_format(
-        self, database: Database, test_settings: Settings, admin_user: User, admin_chat: Chat
+        self,
+        database: Database,
+        test_settings: Settings,
+        admin_user: User,
+        admin_chat: Chat,
+        aiogram_mocks: AiogramMocks,
     ):
         """Test exclude with invalid command format."""
         message = create_message("/exclude @testplayer", admin_user, admin_chat)
 
-        with patch.object(Message, "answer", new=AsyncMock()) as mock_answer:
-            await cmd_exclude(message, database, test_settings)
+        await cmd_exclude(message, database, settings=test_settings)
 
-            # Check that error message was sent
-            mock_answer.assert_called_once()
-            response_text = mock_answer.call_args[0][0]
-            assert "неверный формат" in response_text.lower()
+        # Check that error message was sent
+        aiogram_mocks.message_answer.assert_called_once()
+        response_text = aiogram_mocks.message_answer.call_args[0][0]
+        assert "неверный формат" in response_text.lower()
 
     @pytest.mark.asyncio
     async def test_exclude_non_existing_player(
-        self, database: Database, test_settings: Settings, admin_user: User, admin_chat: Chat
+        self,
+        database: Database,
+        test_settings: Settings,
+        admin_user: User,
+        admin_chat: Chat,
+        aiogram_mocks: AiogramMocks,
     ):
         """Test excluding player that doesn't exist."""
         message = create_message("/exclude @nonexistent Причина", admin_user, admin_chat)
 
-        with patch.object(Message, "answer", new=AsyncMock()) as mock_answer:
-            await cmd_exclude(message, database, test_settings)
+        await cmd_exclude(message, database, settings=test_settings)
 
-            # Check that error message was sent
-            mock_answer.assert_called_once()
-            response_text = mock_answer.call_args[0][0]
-            assert "не найден" in response_text.lower()
+        # Check that error message was sent
+        aiogram_mocks.message_answer.assert_called_once()
+        response_text = aiogram_mocks.message_answer.call_args[0][0]
+        assert "не найден" in response_text.lower()
@@ -1,6 +1,7 @@
 """Integration tests for registration handlers."""
 
 from datetime import datetime
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -68,7 +69,7 @@ class TestRegisterCommand:
         # Add user to database
         from models.player import Player
 
-        async for session in database.get_session():
+        async with database.session() as session:
             repo = PlayerRepository(session)
             player = Player(
                 telegram_id=user.id,
@@ -95,7 +96,7 @@ class TestRegisterCommand:
         assert state is None
 
     @pytest.mark.asyncio
-    async def test_register_pending_application(
+    async def test_register_with_pending_application(
         self,
         database: Database,
         test_settings: Settings,
@@ -103,29 +104,28 @@ class TestRegisterCommand:
         user: User,
         chat: Chat,
     ):
-        """Test that user with pending application cannot register again."""
-        # Add pending registration
+        """Test that a user with a pending application is stopped before the captcha."""
         from models.player import PendingRegistration
 
-        async for session in database.get_session():
-            repo = PlayerRepository(session)
-            pending = PendingRegistration(
-                telegram_id=user.id,
-                username=f"@{user.username}",
-                nickname="PendingPlayer",
-                screenshot_path="/path/to/screenshot.jpg",
+        async with database.session() as session:
+            await PlayerRepository(session).save_pending(
+                PendingRegistration(
+                    telegram_id=user.id,
+                    username=f"@{user.username}",
+                    nickname="PendingPlayer",
+                    screenshot_path="/path/to/screenshot.jpg",
+                )
             )
-            await repo.save_pending(pending)
 
         message = create_message("/register", user, chat)
 
         with patch.object(Message, "answer", new=AsyncMock()) as mock_answer:
             await cmd_register(message, fsm_context, database)
 
-            # Check that bot sent rejection message
             mock_answer.assert_called_once()
-            call_text = mock_answer.call_args[0][0]
-            assert "заявка уже отправлена" in call_text.lower()
+            assert "заявка уже отправлена" in mock_answer.call_args[0][0].lower()
+
+        assert await fsm_context.get_state() is None
 
 
 class TestNicknameProcess:
@@ -244,8 +244,7 @@ class TestScreenshotProcess:
         mock_bot.get_file = AsyncMock(return_value=mock_file)
         mock_bot.download_file = AsyncMock(return_value=b"fake_image_data")
         mock_bot.send_photo = AsyncMock()
-        # Use object.__setattr__ to bypass frozen model
-        object.__setattr__(message, "_bot", mock_bot)
+        message = message.as_(mock_bot)
 
         with patch.object(Message, "answer", new=AsyncMock()) as mock_answer:
             await process_screenshot(message, fsm_context, database, test_settings)
@@ -265,13 +264,113 @@ class TestScreenshotProcess:
         assert state is None
 
         # Check pending registration was saved
-        async for session in database.get_session():
+        async with database.session() as session:
             repo = PlayerRepository(session)
             pending = await repo.get_pending(user.id)
             assert pending is not None
             assert pending.nickname == "TestPlayer"
             assert pending.username == f"@{user.username}"
 
+    @pytest.mark.asyncio
+    async def test_screenshot_download_failure_saves_nothing(
+        self,
+        database: Database,
+        test_settings: Settings,
+        fsm_context: FSMContext,
+        user: User,
+        chat: Chat,
+    ):
+        """Test that a failed download leaves no pending row and no partial file."""
+        await fsm_context.set_state(RegistrationStates.waiting_for_screenshot)
+        await fsm_context.update_data(nickname="TestPlayer")
+
+        photo = PhotoSize(
+            file_id="test_file_id", file_unique_id="test_unique_id", width=800, height=600
+        )
+        message = create_message("", user, chat, photo=[photo])
+
+        async def failing_download(file_path, destination):
+            with open(destination, "wb") as f:
+                f.write(b"partial")
+            raise OSError("disk full")
+
+        mock_file = MagicMock()
+        mock_file.file_path = "photos/test.jpg"
+        mock_bot = MagicMock()
+        mock_bot.get_file = AsyncMock(return_value=mock_file)
+        mock_bot.download_file = AsyncMock(side_effect=failing_download)
+        mock_bot.send_photo = AsyncMock()
+        message = message.as_(mock_bot)
+
+        with patch.object(Message, "answer", new=AsyncMock()) as mock_answer:
+            await process_screenshot(message, fsm_context, database, test_settings)
+
+            mock_answer.assert_called_once()
+            assert "ошибка" in mock_answer.call_args[0][0].lower()
+            mock_bot.send_photo.assert_not_called()
+
+        assert await fsm_context.get_state() is None
+        assert list(Path(test_settings.storage.screenshots_dir).iterdir()) == []
+
+        # The user can apply again
+        async with database.session() as session:
+            assert await PlayerRepository(session).get_pending(user.id) is None
+
+    @pytest.mark.asyncio
+    async def test_screenshot_with_pending_application(
+        self,
+        database: Database,
+        test_settings: Settings,
+        fsm_context: FSMContext,
+        user: User,
+        chat: Chat,
+    ):
+        """Test that a second application is not saved while one is pending."""
+        from models.player import PendingRegistration
+
+        async with database.session() as session:
+            repo = PlayerRepository(session)
+            await repo.save_pending(
+                PendingRegistration(
+                    telegram_id=user.id,
+                    username=f"@{user.username}",
+                    nickname="PendingPlayer",
+                    screenshot_path="/path/to/screenshot.jpg",
+                )
+            )
+
+        await fsm_context.set_state(RegistrationStates.waiting_for_screenshot)
+        await fsm_context.update_data(nickname="TestPlayer")
+
+        photo = PhotoSize(
+            file_id="test_file_id", file_unique_id="test_unique_id", width=800, height=600
+        )
+        message = create_message("", user, chat, photo=[photo])
+
+        mock_file = MagicMock()
+        mock_file.file_path = "photos/test.jpg"
+        mock_bot = MagicMock()
+        mock_bot.get_file = AsyncMock(return_value=mock_file)
+        mock_bot.download_file = AsyncMock()
+        mock_bot.send_photo = AsyncMock()
+        message = message.as_(mock_bot)
+
+        with patch.object(Message, "answer", new=AsyncMock()) as mock_answer:
+            await process_screenshot(message, fsm_context, database, test_settings)
+
+            mock_answer.assert_called_once()
+            call_text = mock_answer.call_args[0][0]
+            assert "заявка уже отправлена" in call_text.lower()
+            mock_bot.send_photo.assert_not_called()
+
+        assert await fsm_context.get_state() is None
+
+        # Original application is kept
+        async with database.session() as session:
+            repo = PlayerRepository(session)
+            pending = await repo.get_pending(user.id)
+            assert pending.nickname == "PendingPlayer"
+
     @pytest.mark.asyncio
     async def test_no_photo_sent(self, fsm_context: FSMContext, user: User, chat: Chat):
         """Test when user sends message without photo."""
@@ -285,7 +384,8 @@ class TestScreenshotProcess:
             # Check that bot sent error message
             mock_answer.assert_called_once()
             call_text = mock_answer.call_args[0][0]
-            assert "отправьте" in call_text.lower() and "фотографию" in call_text.lower()
+            call_text_lower = call_text.lower()
+            assert "отправьте" in call_text_lower and "фотографию" in call_text_lower
 
         # Check FSM state did not change (should remain in waiting_for_screenshot)
         state = await fsm_context.get_state()
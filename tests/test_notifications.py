@@ -0,0 +1,76 @@
+"""Tests for notification helpers."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from utils.notifications import MESSAGES_PER_SECOND, notify_users
+
+
+class TestNotifyUsers:
+    """Tests for notify_users."""
+
+    @pytest.mark.asyncio
+    async def test_sends_all_messages(self):
+        """Test that every (chat_id, text) pair is delivered."""
+        bot = MagicMock()
+        bot.send_message = AsyncMock()
+
+        failed = await notify_users(bot, [(1, "one"), (2, "two")])
+
+        assert failed == []
+        assert bot.send_message.await_count == 2
+        bot.send_message.assert_any_await(chat_id=1, text="one")
+        bot.send_message.assert_any_await(chat_id=2, text="two")
+
+    @pytest.mark.asyncio
+    async def test_failure_does_not_stop_other_sends(self):
+        """Test that a failed send is reported and the rest still go out."""
+        bot = MagicMock()
+        bot.send_message = AsyncMock(side_effect=[RuntimeError("blocked"), None])
+
+        failed = await notify_users(bot, [(1, "one"), (2, "two")])
+
+        assert failed == [1]
+        assert bot.send_message.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_sends_are_rate_limited(self):
+        """Test that sends start no faster than MESSAGES_PER_SECOND."""
+        loop = asyncio.get_running_loop()
+        started: list[float] = []
+        bot = MagicMock()
+        bot.send_message = AsyncMock(side_effect=lambda **kwargs: started.append(loop.time()))
+
+        await notify_users(bot, [(chat_id, "hi") for chat_id in range(4)])
+
+        assert len(started) == 4
+        # Three intervals between the first and the last send (small slack for timer jitter)
+        assert started[-1] - started[0] >= 3 / MESSAGES_PER_SECOND * 0.9
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_rate_limit(self):
+        """Test that sends from concurrent calls are spaced out together."""
+        loop = asyncio.get_running_loop()
+        started: list[float] = []
+        bot = MagicMock()
+        bot.send_message = AsyncMock(side_effect=lambda **kwargs: started.append(loop.time()))
+
+        await asyncio.gather(
+            notify_users(bot, [(1, "one"), (2, "two")]),
+            notify_users(bot, [(3, "three"), (4, "four")]),
+        )
+
+        assert len(started) == 4
+        # One budget for both calls: three intervals, as for a single call of four sends
+        assert started[-1] - started[0] >= 3 / MESSAGES_PER_SECOND * 0.9
+
+    @pytest.mark.asyncio
+    async def test_empty_pairs(self):
+        """Test that nothing is sent for an empty list."""
+        bot = MagicMock()
+        bot.send_message = AsyncMock()
+
+        assert await notify_users(bot, []) == []
+        bot.send_message.assert_not_awaited()
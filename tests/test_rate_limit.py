@@ -8,6 +8,20 @@ from aiogram.types import Message, User
 from bot.middleware.rate_limit import RateLimitMiddleware
 
 
+def _command_message(user_id: int = 12345, text: str | None = "/start") -> MagicMock:
+    """Create a Message mock with a command sent by user_id."""
+    user = MagicMock(spec=User)
+    user.id = user_id
+    user.username = f"user{user_id}"
+
+    message = MagicMock(spec=Message)
+    message.text = text
+    message.caption = None
+    message.from_user = user
+    message.answer = AsyncMock()
+    return message
+
+
 class TestRateLimitMiddleware:
     """Test RateLimitMiddleware class."""
 
@@ -17,8 +31,9 @@ class TestRateLimitMiddleware:
 
         assert middleware.rate_limit == 5
         assert middleware.time_window == 60
-        assert isinstance(middleware.user_timestamps, dict)
-        assert len(middleware.user_timestamps) == 0
+        assert middleware.drip_rate == 5 / 60
+        assert isinstance(middleware.state, dict)
+        assert len(middleware.state) == 0
 
     def test_init_custom_params(self):
         """Test middleware initialization with custom parameters."""
@@ -27,105 +42,101 @@ class TestRateLimitMiddleware:
         assert middleware.rate_limit == 10
         assert middleware.time_window == 120
 
-    def test_cleanup_old_timestamps(self):
-        """Test cleanup of old timestamps."""
-        middleware = RateLimitMiddleware(rate_limit=5, time_window=60)
+    def test_is_rate_limited_unknown_user_creates_no_state(self):
+        """Test that checking a new user does not add an entry for them."""
+        middleware = RateLimitMiddleware()
 
-        # Add timestamps: some old, some recent
-        current_time = 1000.0
-        user_id = 12345
+        assert middleware._is_rate_limited(12345, 1000.0) == (False, 0)
+        assert 12345 not in middleware.state
 
-        middleware.user_timestamps[user_id] = [
-            900.0,  # 100 seconds ago - should be removed
-            920.0,  # 80 seconds ago - should be removed
-            950.0,  # 50 seconds ago - should stay
-            980.0,  # 20 seconds ago - should stay
-            995.0,  # 5 seconds ago - should stay
-        ]
-
-        middleware._cleanup_old_timestamps(user_id, current_time)
-
-        # Should keep only timestamps within 60 seconds
-        assert len(middleware.user_timestamps[user_id]) == 3
-        assert 900.0 not in middleware.user_timestamps[user_id]
-        assert 920.0 not in middleware.user_timestamps[user_id]
-        assert 950.0 in middleware.user_timestamps[user_id]
-        assert 980.0 in middleware.user_timestamps[user_id]
-        assert 995.0 in middleware.user_timestamps[user_id]
-
-    @patch("bot.middleware.rate_limit.time.time")
-    def test_is_rate_limited_below_limit(self, mock_time):
-        """Test rate limiting when user is below limit."""
-        mock_time.return_value = 1000.0
+    def test_burst_then_limited(self):
+        """Test that a full bucket allows rate_limit requests, then blocks."""
+        now = 1000.0
         middleware = RateLimitMiddleware(rate_limit=5, time_window=60)
         user_id = 12345
 
-        # Add 3 recent timestamps (below limit of 5)
-        middleware.user_timestamps[user_id] = [990.0, 995.0, 998.0]
+        for _ in range(5):
+            assert middleware._is_rate_limited(user_id, now) == (False, 0)
+            middleware._record_request(user_id, now)
+
+        is_limited, seconds = middleware._is_rate_limited(user_id, now)
+        assert is_limited is True
+        # One token drips in every 12 seconds
+        assert seconds == 13
 
-        is_limited, seconds = middleware._is_rate_limited(user_id)
+    def test_is_rate_limited_partial_token(self):
+        """Test that the reset time counts only the missing part of a token."""
+        middleware = RateLimitMiddleware(rate_limit=5, time_window=60)
+        user_id = 12345
+        middleware.state[user_id] = (0.5, 1000.0)
 
-        assert is_limited is False
-        assert seconds == 0
+        is_limited, seconds = middleware._is_rate_limited(user_id, 1000.0)
 
-    @patch("bot.middleware.rate_limit.time.time")
-    def test_is_rate_limited_at_limit(self, mock_time):
-        """Test rate limiting when user is at limit."""
-        mock_time.return_value = 1000.0
+        assert is_limited is True
+        # Half a token takes 6 seconds to drip in
+        assert seconds == 7
+
+    def test_tokens_refill_over_time(self):
+        """Test that tokens are refilled at rate_limit / time_window per second."""
+        now = 1000.0
         middleware = RateLimitMiddleware(rate_limit=5, time_window=60)
         user_id = 12345
+        middleware.state[user_id] = (0.0, 1000.0)
 
-        # Add exactly 5 timestamps (at limit)
-        middleware.user_timestamps[user_id] = [950.0, 970.0, 980.0, 990.0, 995.0]
+        assert middleware._is_rate_limited(user_id, now)[0] is True
 
-        is_limited, seconds = middleware._is_rate_limited(user_id)
+        now = 1012.0
+        assert middleware._is_rate_limited(user_id, now) == (False, 0)
 
-        assert is_limited is True
-        assert seconds > 0
-        # Oldest timestamp is 950.0, so reset should be in 60 - (1000 - 950) = 10 seconds
-        assert seconds == 11  # +1 for rounding
+        middleware._record_request(user_id, now)
+        assert middleware.state[user_id] == (0.0, 1012.0)
 
-    @patch("bot.middleware.rate_limit.time.time")
-    def test_is_rate_limited_cleanup_works(self, mock_time):
-        """Test that cleanup happens during rate limit check."""
-        mock_time.return_value = 1000.0
+    def test_tokens_capped_at_rate_limit(self):
+        """Test that an idle user never accumulates more than rate_limit tokens."""
         middleware = RateLimitMiddleware(rate_limit=5, time_window=60)
         user_id = 12345
+        middleware.state[user_id] = (0.0, 0.0)
 
-        # Add 6 timestamps, but 2 are old (should be cleaned up)
-        middleware.user_timestamps[user_id] = [
-            900.0,  # Old - should be removed
-            920.0,  # Old - should be removed
-            950.0,
-            970.0,
-            980.0,
-            990.0,
-        ]
-
-        is_limited, seconds = middleware._is_rate_limited(user_id)
-
-        # After cleanup, only 4 recent timestamps remain (below limit)
-        assert is_limited is False
-        assert seconds == 0
-        assert len(middleware.user_timestamps[user_id]) == 4
-
-    @patch("bot.middleware.rate_limit.time.time")
-    def test_record_request(self, mock_time):
-        """Test recording new request timestamp."""
-        mock_time.return_value = 1000.0
+        assert middleware._tokens(user_id, 1000.0) == 5.0
+
+    def test_record_request(self):
+        """Test that recording a request takes one token."""
+        now = 1000.0
         middleware = RateLimitMiddleware()
         user_id = 12345
 
-        # Record first request
-        middleware._record_request(user_id)
-        assert len(middleware.user_timestamps[user_id]) == 1
-        assert middleware.user_timestamps[user_id][0] == 1000.0
+        # First request starts from a full bucket
+        middleware._record_request(user_id, now)
+        assert middleware.state[user_id] == (4.0, 1000.0)
+
+        # Second request, one token has dripped in since
+        now = 1012.0
+        middleware._record_request(user_id, now)
+        assert middleware.state[user_id] == (4.0, 1012.0)
+
+    def test_gc_drops_full_buckets(self):
+        """Test that GC forgets users whose bucket is full again."""
+        middleware = RateLimitMiddleware(rate_limit=5, time_window=60)
+        middleware.state[1] = (4.0, 1000.0)  # Full again after 12 seconds
+        middleware.state[2] = (0.0, 1000.0)  # Needs 60 seconds to refill
+
+        middleware._gc(1030.0)
+
+        assert 1 not in middleware.state
+        assert 2 in middleware.state
+
+    @pytest.mark.asyncio
+    @patch("bot.middleware.rate_limit.time.monotonic")
+    async def test_call_runs_gc_periodically(self, mock_time):
+        """Test that GC runs every GC_EVERY messages."""
+        mock_time.return_value = 1000.0
+        middleware = RateLimitMiddleware(rate_limit=5, time_window=60)
+        middleware.state[1] = (0.0, 900.0)
+        middleware._call_count = middleware.GC_EVERY - 1
 
-        # Record second request
-        mock_time.return_value = 1005.0
-        middleware._record_request(user_id)
-        assert len(middleware.user_timestamps[user_id]) == 2
-        assert middleware.user_timestamps[user_id][1] == 1005.0
+        await middleware(AsyncMock(), _command_message(), {})
+
+        assert 1 not in middleware.state
 
     @pytest.mark.asyncio
     async def test_call_non_message_event(self):
@@ -147,6 +158,33 @@ class TestRateLimitMiddleware:
         assert result == "handler_result"
         handler.assert_called_once_with(event, data)
 
+    @pytest.mark.asyncio
+    async def test_call_non_command_message(self):
+        """Test that messages that are not commands bypass rate limiting."""
+        middleware = RateLimitMiddleware()
+        handler = AsyncMock(return_value="handler_result")
+
+        message = _command_message(text=None)
+
+        result = await middleware(handler, message, {})
+
+        assert result == "handler_result"
+        assert 12345 not in middleware.state
+
+    @pytest.mark.asyncio
+    async def test_call_exempt_user(self):
+        """Test that exempt users are never rate limited."""
+        middleware = RateLimitMiddleware(rate_limit=1, exempt_user_ids=frozenset({12345}))
+        handler = AsyncMock(return_value="handler_result")
+
+        message = _command_message(text="/pending")
+
+        for _ in range(3):
+            assert await middleware(handler, message, {}) == "handler_result"
+
+        assert handler.call_count == 3
+        assert 12345 not in middleware.state
+
     @pytest.mark.asyncio
     async def test_call_message_without_user(self):
         """Test that messages without user are passed through."""
@@ -156,7 +194,7 @@ class TestRateLimitMiddleware:
         handler = AsyncMock(return_value="handler_result")
 
         # Mock Message without from_user
-        message = MagicMock(spec=Message)
+        message = _command_message()
         message.from_user = None
 
         data = {}
@@ -168,7 +206,7 @@ class TestRateLimitMiddleware:
         handler.assert_called_once_with(message, data)
 
     @pytest.mark.asyncio
-    @patch("bot.middleware.rate_limit.time.time")
+    @patch("bot.middleware.rate_limit.time.monotonic")
     async def test_call_below_rate_limit(self, mock_time):
         """Test message processing when below rate limit."""
         mock_time.return_value = 1000.0
@@ -177,13 +215,7 @@ class TestRateLimitMiddleware:
         # Mock handler
         handler = AsyncMock(return_value="handler_result")
 
-        # Mock Message with User
-        user = MagicMock(spec=User)
-        user.id = 12345
-        user.username = "testuser"
-
-        message = MagicMock(spec=Message)
-        message.from_user = user
+        message = _command_message()
 
         data = {}
 
@@ -192,10 +224,10 @@ class TestRateLimitMiddleware:
 
         assert result == "handler_result"
         handler.assert_called_once_with(message, data)
-        assert len(middleware.user_timestamps[12345]) == 1
+        assert middleware.state[12345] == (4.0, 1000.0)
 
     @pytest.mark.asyncio
-    @patch("bot.middleware.rate_limit.time.time")
+    @patch("bot.middleware.rate_limit.time.monotonic")
     async def test_call_exceeds_rate_limit(self, mock_time):
         """Test message blocking when rate limit exceeded."""
         mock_time.return_value = 1000.0
@@ -204,19 +236,12 @@ class TestRateLimitMiddleware:
         # Mock handler
         handler = AsyncMock(return_value="handler_result")
 
-        # Mock Message with User
-        user = MagicMock(spec=User)
-        user.id = 12345
-        user.username = "testuser"
-
-        message = MagicMock(spec=Message)
-        message.from_user = user
-        message.answer = AsyncMock()
+        message = _command_message()
 
         data = {}
 
-        # Add 5 timestamps (at limit)
-        middleware.user_timestamps[12345] = [950.0, 970.0, 980.0, 990.0, 995.0]
+        # Empty bucket
+        middleware.state[12345] = (0.0, 1000.0)
 
         # This request should be blocked
         result = await middleware(handler, message, data)
@@ -231,7 +256,7 @@ class TestRateLimitMiddleware:
         assert "сек." in call_args
 
     @pytest.mark.asyncio
-    @patch("bot.middleware.rate_limit.time.time")
+    @patch("bot.middleware.rate_limit.time.monotonic")
     async def test_call_multiple_users_independent(self, mock_time):
         """Test that rate limiting is independent per user."""
         mock_time.return_value = 1000.0
@@ -240,27 +265,14 @@ class TestRateLimitMiddleware:
         # Mock handler
         handler = AsyncMock(return_value="handler_result")
 
-        # User 1 - at limit
-        user1 = MagicMock(spec=User)
-        user1.id = 11111
-        user1.username = "user1"
-
-        message1 = MagicMock(spec=Message)
-        message1.from_user = user1
-        message1.answer = AsyncMock()
-
-        # User 2 - below limit
-        user2 = MagicMock(spec=User)
-        user2.id = 22222
-        user2.username = "user2"
-
-        message2 = MagicMock(spec=Message)
-        message2.from_user = user2
+        # User 1 - at limit, user 2 - below limit
+        message1 = _command_message(11111)
+        message2 = _command_message(22222)
 
         data = {}
 
-        # Set user1 at limit
-        middleware.user_timestamps[11111] = [950.0, 970.0, 980.0, 990.0, 995.0]
+        # Empty user1's bucket
+        middleware.state[11111] = (0.0, 1000.0)
 
         # User1 should be blocked
         result1 = await middleware(handler, message1, data)
@@ -274,36 +286,28 @@ class TestRateLimitMiddleware:
         handler.assert_called_once_with(message2, data)
 
     @pytest.mark.asyncio
-    @patch("bot.middleware.rate_limit.time.time")
+    @patch("bot.middleware.rate_limit.time.monotonic")
     async def test_call_rate_limit_resets_after_time_window(self, mock_time):
-        """Test that rate limit resets after time window passes."""
+        """Test that the bucket refills after the time window passes."""
         middleware = RateLimitMiddleware(rate_limit=5, time_window=60)
 
         # Mock handler
         handler = AsyncMock(return_value="handler_result")
 
-        # Mock Message with User
-        user = MagicMock(spec=User)
-        user.id = 12345
-        user.username = "testuser"
-
-        message = MagicMock(spec=Message)
-        message.from_user = user
-        message.answer = AsyncMock()
+        message = _command_message()
 
         data = {}
 
         # Initial time: 1000.0
         mock_time.return_value = 1000.0
 
-        # Add 5 old timestamps (more than 60 seconds old)
-        middleware.user_timestamps[12345] = [900.0, 910.0, 920.0, 930.0, 940.0]
+        # Bucket emptied a full time window ago
+        middleware.state[12345] = (0.0, 940.0)
 
-        # Should pass because old timestamps will be cleaned up
+        # Should pass because the bucket has refilled
         result = await middleware(handler, message, data)
 
         assert result == "handler_result"
         handler.assert_called_once()
-        # All old timestamps should be removed, new one added
-        assert len(middleware.user_timestamps[12345]) == 1
-        assert middleware.user_timestamps[12345][0] == 1000.0
+        # Refilled bucket minus the token just taken
+        assert middleware.state[12345] == (4.0, 1000.0)
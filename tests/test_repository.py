@@ -4,31 +4,14 @@ from datetime import datetime
 
 import pytest
 
-from database.database import Database
 from database.repository import PlayerRepository
 from models.player import PendingRegistration, Player
 
 
-@pytest.fixture
-def test_database_url():
-    """Test database URL (in-memory SQLite for testing)."""
-    return "sqlite+aiosqlite:///:memory:"
-
-
-@pytest.fixture
-async def database(test_database_url):
-    """Create and initialize test database."""
-    db = Database(test_database_url, echo=False)
-    db.init()
-    await db.create_tables()
-    yield db
-    await db.close()
-
-
 @pytest.fixture
 async def session(database):
     """Get a database session for testing."""
-    async for sess in database.get_session():
+    async with database.session() as sess:
         yield sess
 
 
@@ -78,7 +61,16 @@ class TestAddPlayer:
         assert added_player.nickname == sample_player.nickname
 
     @pytest.mark.asyncio
-    @pytest.mark.skip(reason="SQLite aiosqlite has issues with RETURNING after IntegrityError")
+    async def test_add_player_uses_server_registration_date(self, repository, sample_player):
+        """Test that registration_date comes from the database, not the dataclass."""
+        sample_player.registration_date = "2000-01-01"
+
+        added_player = await repository.add_player(sample_player)
+
+        assert added_player.registration_date != "2000-01-01"
+        assert datetime.strptime(added_player.registration_date, "%Y-%m-%d")
+
+    @pytest.mark.asyncio
     async def test_add_duplicate_player_fails(self, database):
         """Test that adding duplicate player raises IntegrityError."""
         from sqlalchemy.exc import IntegrityError
@@ -90,17 +82,34 @@ class TestAddPlayer:
         )
 
         # Add player in first session
-        async for session in database.get_session():
+        async with database.session() as session:
             repo = PlayerRepository(session)
             await repo.add_player(player)
-            break
 
         # Try to add same player in new session
         with pytest.raises(IntegrityError):
-            async for session in database.get_session():
+            async with database.session() as session:
                 repo = PlayerRepository(session)
                 await repo.add_player(player)
-                break
+
+    @pytest.mark.asyncio
+    async def test_add_players(self, repository):
+        """Test adding several players in one statement."""
+        players = [
+            Player(telegram_id=100 + i, username=f"@bulk{i}", nickname=f"Bulk{i}") for i in range(3)
+        ]
+
+        assert await repository.add_players(players) == 3
+
+        stored = await repository.get_player(101)
+        assert stored is not None
+        assert stored.username == "@bulk1"
+        assert stored.registration_date
+
+    @pytest.mark.asyncio
+    async def test_add_players_empty(self, repository):
+        """Test that an empty batch is a no-op."""
+        assert await repository.add_players([]) == 0
 
 
 class TestGetPlayer:
@@ -122,6 +131,17 @@ class TestGetPlayer:
         retrieved = await repository.get_player(999999)
         assert retrieved is None
 
+    @pytest.mark.asyncio
+    async def test_get_by_username(self, repository, sample_player):
+        """Test retrieving a player by username."""
+        await repository.add_player(sample_player)
+
+        retrieved = await repository.get_by_username(sample_player.username)
+        assert retrieved is not None
+        assert retrieved.telegram_id == sample_player.telegram_id
+
+        assert await repository.get_by_username("@nobody") is None
+
     @pytest.mark.asyncio
     async def test_check_player_exists(self, repository, sample_player):
         """Test checking if player exists."""
@@ -138,9 +158,8 @@ class TestGetAllPlayers:
     @pytest.mark.asyncio
     async def test_get_all_players_empty(self, repository):
         """Test getting all players when database is empty."""
-        players = await repository.get_all_players()
+        players = [p async for p in repository.get_all_players()]
         assert len(players) == 0
-        assert isinstance(players, list)
 
     @pytest.mark.asyncio
     async def test_get_all_players_with_data(self, repository):
@@ -161,13 +180,38 @@ class TestGetAllPlayers:
         await repository.add_player(player1)
         await repository.add_player(player2)
 
-        players = await repository.get_all_players()
+        players = [p async for p in repository.get_all_players(batch_size=1)]
         assert len(players) == 2
         telegram_ids = [p.telegram_id for p in players]
         assert 111 in telegram_ids
         assert 222 in telegram_ids
 
 
+class TestPlayersByStatus:
+    """Test status-filtered counting and paging."""
+
+    @pytest.mark.asyncio
+    async def test_count_and_list_by_status(self, repository):
+        """Test counting and listing players by status."""
+        for i in range(5):
+            await repository.add_player(
+                Player(telegram_id=100 + i, username=f"@user{i}", nickname=f"Nick{i}")
+            )
+        await repository.add_player(
+            Player(telegram_id=200, username="@gone", nickname="Gone", status="Отчислен")
+        )
+
+        assert await repository.count_by_status() == 6
+        assert await repository.count_by_status("Активен") == 5
+        assert await repository.count_by_status("Отчислен") == 1
+
+        page = await repository.list_by_status("Активен", limit=2)
+        assert [p.telegram_id for p in page] == [104, 103]
+
+        next_page = await repository.list_by_status("Активен", limit=2, offset=2)
+        assert [p.telegram_id for p in next_page] == [102, 101]
+
+
 class TestUpdatePlayerStatus:
     """Test updating player status."""
 
@@ -222,7 +266,7 @@ class TestGetExcludedPlayers:
     @pytest.mark.asyncio
     async def test_get_excluded_players_empty(self, repository):
         """Test getting excluded players when none exist."""
-        excluded = await repository.get_excluded_players()
+        excluded = [p async for p in repository.get_excluded_players()]
         assert len(excluded) == 0
 
     @pytest.mark.asyncio
@@ -240,7 +284,7 @@ class TestGetExcludedPlayers:
         await repository.exclude_player(player1.telegram_id, "Reason 1", "admin")
         await repository.exclude_player(player2.telegram_id, "Reason 2", "admin")
 
-        excluded = await repository.get_excluded_players()
+        excluded = [p async for p in repository.get_excluded_players(batch_size=1)]
         assert len(excluded) == 2
         telegram_ids = [p.telegram_id for p in excluded]
         assert 111 in telegram_ids
@@ -259,6 +303,22 @@ class TestPendingRegistrations:
         assert saved.telegram_id == sample_pending.telegram_id
         assert saved.username == sample_pending.username
 
+    @pytest.mark.asyncio
+    async def test_save_pending_duplicate_returns_none(self, repository, sample_pending):
+        """Test that saving a second request for the same user is a no-op."""
+        await repository.save_pending(sample_pending)
+
+        duplicate = PendingRegistration(
+            telegram_id=sample_pending.telegram_id,
+            username=sample_pending.username,
+            nickname="OtherNick",
+            screenshot_path="/other.jpg",
+        )
+        assert await repository.save_pending(duplicate) is None
+
+        retrieved = await repository.get_pending(sample_pending.telegram_id)
+        assert retrieved.nickname == sample_pending.nickname
+
     @pytest.mark.asyncio
     async def test_get_pending(self, repository, sample_pending):
         """Test retrieving a pending registration."""
@@ -268,6 +328,14 @@ class TestPendingRegistrations:
         assert retrieved is not None
         assert retrieved.telegram_id == sample_pending.telegram_id
 
+    @pytest.mark.asyncio
+    async def test_pending_exists(self, repository, sample_pending):
+        """Test checking whether a pending registration exists."""
+        assert await repository.pending_exists(sample_pending.telegram_id) is False
+
+        await repository.save_pending(sample_pending)
+        assert await repository.pending_exists(sample_pending.telegram_id) is True
+
     @pytest.mark.asyncio
     async def test_get_pending_by_username(self, repository, sample_pending):
         """Test retrieving pending by username."""
@@ -288,6 +356,82 @@ class TestPendingRegistrations:
 
         assert await repository.get_pending(sample_pending.telegram_id) is None
 
+    @pytest.mark.asyncio
+    async def test_approve_pending(self, repository, sample_pending):
+        """Test moving a pending registration into players."""
+        await repository.save_pending(sample_pending)
+
+        found, player = await repository.approve_pending(
+            sample_pending.telegram_id, added_by="@admin", notes="Approved"
+        )
+        assert found is True
+        assert player is not None
+        assert player.nickname == sample_pending.nickname
+        assert player.added_by == "@admin"
+        assert await repository.get_pending(sample_pending.telegram_id) is None
+
+    @pytest.mark.asyncio
+    async def test_approve_pending_not_found(self, repository):
+        """Test approving a missing pending registration."""
+        assert await repository.approve_pending(999999, added_by="@admin") == (False, None)
+
+    @pytest.mark.asyncio
+    async def test_approve_pending_already_registered(self, repository, sample_pending):
+        """Test approving a user who is already a player drops the pending row."""
+        await repository.add_player(
+            Player(
+                telegram_id=sample_pending.telegram_id,
+                username=sample_pending.username,
+                nickname="Existing",
+            )
+        )
+        await repository.save_pending(sample_pending)
+
+        found, player = await repository.approve_pending(
+            sample_pending.telegram_id, added_by="@admin"
+        )
+        assert found is True
+        assert player is None
+        assert await repository.get_pending(sample_pending.telegram_id) is None
+        assert (await repository.get_player(sample_pending.telegram_id)).nickname == "Existing"
+
+    @pytest.mark.asyncio
+    async def test_approve_pending_by_username(self, repository, sample_pending):
+        """Test approving a pending registration found by username."""
+        await repository.save_pending(sample_pending)
+
+        found, player = await repository.approve_pending_by_username(
+            sample_pending.username, added_by="@admin"
+        )
+        assert found is True
+        assert player.telegram_id == sample_pending.telegram_id
+        assert await repository.get_pending(sample_pending.telegram_id) is None
+
+        assert await repository.approve_pending_by_username("@nobody", added_by="@admin") == (
+            False,
+            None,
+        )
+
+    @pytest.mark.asyncio
+    async def test_approve_pending_by_username_takes_oldest(self, repository, sample_pending):
+        """Test that only the oldest of two requests sharing a username is approved."""
+        await repository.save_pending(sample_pending)
+        newer = PendingRegistration(
+            telegram_id=111,
+            username=sample_pending.username,
+            nickname="Newer",
+            screenshot_path="/path1.jpg",
+        )
+        await repository.save_pending(newer)
+
+        found, player = await repository.approve_pending_by_username(
+            sample_pending.username, added_by="@admin"
+        )
+        assert found is True
+        assert player.telegram_id == sample_pending.telegram_id
+        assert await repository.get_pending(sample_pending.telegram_id) is None
+        assert await repository.get_pending(newer.telegram_id) is not None
+
     @pytest.mark.asyncio
     async def test_get_all_pending(self, repository):
         """Test getting all pending registrations."""
@@ -309,3 +453,19 @@ class TestPendingRegistrations:
 
         all_pending = await repository.get_all_pending()
         assert len(all_pending) == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_all_pending(self, repository):
+        """Test streaming pending registrations in batches."""
+        for i in range(3):
+            await repository.save_pending(
+                PendingRegistration(
+                    telegram_id=100 + i,
+                    username=f"@pending{i}",
+                    nickname=f"Pending{i}",
+                    screenshot_path=f"/path{i}.jpg",
+                )
+            )
+
+        streamed = [p async for p in repository.stream_all_pending(batch_size=2)]
+        assert sorted(p.telegram_id for p in streamed) == [100, 101, 102]
@@ -8,38 +8,37 @@
 
 import json
 import random
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Final
 
 
-@dataclass
+@dataclass(frozen=True)
 class CaptchaQuestion:
     """Represents a captcha question with answer options."""
 
     question: str
     correct_answer: str
     wrong_answers: list[str]
+    # Derived once instead of on every keyboard build
+    _options: tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _buttons: tuple[tuple[str, str], ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_options", (self.correct_answer, *self.wrong_answers))
+        object.__setattr__(
+            self, "_buttons", tuple((option, f"captcha:{option}") for option in self._options)
+        )
 
     def get_shuffled_options(self) -> list[str]:
         """Return shuffled list of all answer options."""
-        options = [self.correct_answer] + self.wrong_answers
-        random.shuffle(options)
-        return options
-
-    def is_correct(self, answer: str) -> bool:
-        """Check if provided answer is correct."""
-        return answer.lower().strip() == self.correct_answer.lower().strip()
+        return random.sample(self._options, len(self._options))
 
 
 def load_questions(file_path: str | Path = "data/captcha_questions.json") -> list[CaptchaQuestion]:
     """Load captcha questions from JSON file."""
-    path = Path(file_path)
-
-    if not path.exists():
-        raise FileNotFoundError(f"Captcha questions file not found: {path}")
-
-    with open(path, encoding="utf-8") as f:
-        data = json.load(f)
+    # read_bytes() raises FileNotFoundError itself; json.loads detects the UTF-8 encoding
+    data = json.loads(Path(file_path).read_bytes())
 
     questions = []
     for item in data:
@@ -53,24 +52,31 @@ def load_questions(file_path: str | Path = "data/captcha_questions.json") -> lis
     return questions
 
 
-# Global cache of questions (loaded once at module import)
-_QUESTIONS_CACHE: list[CaptchaQuestion] | None = None
+_CAPTCHA_EXPLANATION: Final[str] = (
+    "🛡 <b>Проверка безопасности</b>\n\n"
+    "Для защиты от автоматических ботов и спама, пожалуйста, "
+    "ответьте на простой вопрос. Это займет всего несколько секунд.\n\n"
+    "<i>Это помогает нам поддерживать качество чата и защищает "
+    "от нежелательных заявок.</i>"
+)
 
+# Global cache of questions (loaded once, on first use), immutable so it can be shared
+_QUESTIONS_CACHE: tuple[CaptchaQuestion, ...] | None = None
 
-def get_questions() -> list[CaptchaQuestion]:
+
+def get_questions() -> tuple[CaptchaQuestion, ...]:
     """Get all captcha questions (cached)."""
     global _QUESTIONS_CACHE
 
     if _QUESTIONS_CACHE is None:
-        _QUESTIONS_CACHE = load_questions()
+        _QUESTIONS_CACHE = tuple(load_questions())
 
     return _QUESTIONS_CACHE
 
 
 def generate_captcha() -> CaptchaQuestion:
     """Generate a random captcha question."""
-    questions = get_questions()
-    return random.choice(questions)
+    return random.choice(get_questions())
 
 
 def get_captcha_keyboard_data(question: CaptchaQuestion) -> list[tuple[str, str]]:
@@ -79,21 +85,20 @@ def get_captcha_keyboard_data(question: CaptchaQuestion) -> list[tuple[str, str]
 
     Returns list of (button_text, callback_data) tuples.
     """
-    options = question.get_shuffled_options()
-    return [(option, f"captcha:{option}") for option in options]
+    buttons = question._buttons
+    return random.sample(buttons, len(buttons))
+
 
+def normalize_answer(answer: str) -> str:
+    """
+    Normalize captcha answer for comparison.
 
-def validate_captcha_answer(question: CaptchaQuestion, answer: str) -> bool:
-    """Validate user's answer to captcha question."""
-    return question.is_correct(answer)
+    Both the stored correct answer and the user's choice go through this,
+    so the comparison is case insensitive and ignores surrounding whitespace.
+    """
+    return answer.strip().casefold()
 
 
 def get_captcha_explanation() -> str:
     """Get explanation text for why captcha is needed."""
-    return (
-        "🛡 <b>Проверка безопасности</b>\n\n"
-        "Для защиты от автоматических ботов и спама, пожалуйста, "
-        "ответьте на простой вопрос. Это займет всего несколько секунд.\n\n"
-        "<i>Это помогает нам поддерживать качество чата и защищает "
-        "от нежелательных заявок.</i>"
-    )
+    return _CAPTCHA_EXPLANATION
@@ -0,0 +1,94 @@
+"""Helpers for sending Telegram notifications to players."""
+
+import asyncio
+import logging
+from collections.abc import Iterable
+
+from aiogram import Bot
+
+logger = logging.getLogger(__name__)
+
+# Telegram allows roughly 30 messages per second per bot across all chats
+MESSAGES_PER_SECOND = 30
+
+# Concurrency cap: how many sends may be awaiting Telegram at the same time
+MAX_CONCURRENT_SENDS = 10
+
+
+class _RateLimiter:
+    """Spaces out calls to wait() so that at most `rate` callers proceed per second."""
+
+    def __init__(self, rate: float):
+        self._interval = 1 / rate
+        self._next_slot = 0.0
+
+    async def wait(self) -> None:
+        """Sleep until this caller's send slot comes up."""
+        now = asyncio.get_running_loop().time()
+        # Reserve the slot before sleeping; no await in between, so no lock is needed
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+# Shared by every notify_users() call, so concurrent handlers draw from one budget;
+# created on first use together with the loop they are bound to
+_SEND_LIMITS: tuple[asyncio.AbstractEventLoop, _RateLimiter, asyncio.Semaphore] | None = None
+
+
+def _get_send_limits() -> tuple[_RateLimiter, asyncio.Semaphore]:
+    """Get the send rate limiter and concurrency cap for the running event loop."""
+    global _SEND_LIMITS
+
+    loop = asyncio.get_running_loop()
+    if _SEND_LIMITS is None or _SEND_LIMITS[0] is not loop:
+        _SEND_LIMITS = (
+            loop,
+            _RateLimiter(MESSAGES_PER_SECOND),
+            asyncio.Semaphore(MAX_CONCURRENT_SENDS),
+        )
+
+    return _SEND_LIMITS[1], _SEND_LIMITS[2]
+
+
+async def _send(
+    bot: Bot,
+    chat_id: int,
+    text: str,
+    limiter: _RateLimiter,
+    concurrency: asyncio.Semaphore,
+) -> None:
+    await limiter.wait()
+    async with concurrency:
+        await bot.send_message(chat_id=chat_id, text=text)
+
+
+async def notify_users(bot: Bot, pairs: Iterable[tuple[int, str]]) -> list[int]:
+    """
+    Send messages to several users concurrently.
+
+    Sends start at no more than MESSAGES_PER_SECOND per second, with at most
+    MAX_CONCURRENT_SENDS in flight, counted across all concurrent calls. Failed deliveries (blocked bot, deleted
+    chat, etc.) are logged and do not interrupt the remaining sends.
+
+    Args:
+        bot: Bot instance used to send messages
+        pairs: (chat_id, text) pairs to deliver
+
+    Returns:
+        List of chat IDs that could not be notified
+    """
+    pairs = list(pairs)
+    limiter, concurrency = _get_send_limits()
+    results = await asyncio.gather(
+        *(_send(bot, chat_id, text, limiter, concurrency) for chat_id, text in pairs),
+        return_exceptions=True,
+    )
+
+    failed = []
+    for (chat_id, _), result in zip(pairs, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Failed to notify user {chat_id}: {result}")
+            failed.append(chat_id)
+    return failed